@@ -0,0 +1,288 @@
+# Benchmark suite for the scoring, ingestion, charting and PDF stages
+#
+# Usage (from the repository root):
+#   python -m benchmarks.bench --sizes 1000,100000 --output results.json
+#   python -m benchmarks.bench --baseline baseline.json --threshold 0.2
+#
+# Every (stage, size) pair runs in a fresh process so peak RSS is measured per stage.
+# Each run reports wall time (best of --repeat), peak RSS and the tracemalloc peak of
+# Python allocations. Results are written as JSON; with --baseline, any wall time or
+# allocation peak more than --threshold above the baseline is reported as a
+# regression and the exit code is 1.
+import argparse          # For parsing command-line arguments
+import json              # For reading and writing results
+import multiprocessing   # For running each stage in a fresh process
+import platform          # For recording the machine in the results
+import sys               # For exit codes
+import time              # For wall-clock timing
+import tracemalloc       # For Python allocation peaks
+from datetime import datetime, timezone  # For timestamping results
+from io import BytesIO   # For in-memory CSV, chart and PDF buffers
+
+
+# Default cohort sizes
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000, 10_000_000]
+
+# Largest cohort each stage runs on by default; bigger sizes are skipped because the
+# stage would take hours (the per-row Student path, one PDF row per student)
+STAGE_LIMITS = {
+	"student_objects": 1_000_000,
+	"pdf": 100_000,
+}
+
+
+# Generate a synthetic cohort with realistic, correlated marks
+# Each student has a latent ability; subject marks scatter around it and are clipped
+# to 0-100 and rounded to whole marks like typical exam results
+def make_cohort(rows, seed=0):
+	import numpy as np
+	import pandas as pd
+
+	rng = np.random.default_rng(seed)
+	ability = rng.normal(65, 15, rows)
+	marks = {}
+	for subject, offset in (("math", -3), ("science", 0), ("english", 4)):
+		marks[subject] = np.clip(np.round(ability + offset + rng.normal(0, 8, rows)), 0, 100)
+	return pd.DataFrame({
+		"roll_no": np.arange(1, rows + 1),
+		"name": pd.Series(np.arange(1, rows + 1)).map("Student {}".format),
+		**marks,
+	})
+
+
+# Each stage is (setup, run): setup builds the input outside the measurement and run
+# is the measured work. setup receives the cohort size and returns run's argument.
+def _scored(rows):
+	from modules.report import score_dataframe
+	return score_dataframe(make_cohort(rows))
+
+
+def _csv_bytes(rows):
+	return make_cohort(rows).to_csv(index=False).encode()
+
+
+def _run_student_objects(df):
+	from modules.report import StudentReport
+	StudentReport(df).to_dataframe()
+
+
+def _run_scoring(df):
+	from modules.report import StudentReport
+	StudentReport(df, batch=True).to_dataframe()
+
+
+def _run_ingestion(data):
+	from utils.file_utils import read_and_validate_csv
+	read_and_validate_csv(BytesIO(data))
+
+
+def _run_streaming(data):
+	from utils.file_utils import stream_and_score_csv
+	stream_and_score_csv(BytesIO(data))
+
+
+def _chart_runner(name):
+	def run(df):
+		from modules import charts
+		getattr(charts, name)(df, BytesIO())
+	return run
+
+
+def _run_summary(df):
+	from modules.stats import HistogramSummary
+	stats = HistogramSummary.for_schema()
+	stats.update(df)
+	stats.to_frame()
+
+
+def _run_pdf(df):
+	from modules.pdfgenerator import PDFReportGenerator
+	PDFReportGenerator(df, df.describe(), []).generate()
+
+
+STAGES = {
+	"student_objects": (make_cohort, _run_student_objects),
+	"scoring": (make_cohort, _run_scoring),
+	"ingestion": (_csv_bytes, _run_ingestion),
+	"streaming_ingestion": (_csv_bytes, _run_streaming),
+	"summary": (_scored, _run_summary),
+	"chart_avg_subject": (_scored, _chart_runner("save_avg_subject_chart")),
+	"chart_gpa_trend": (_scored, _chart_runner("save_gpa_trend_chart")),
+	"chart_heatmap": (_scored, _chart_runner("save_heatmap")),
+	"chart_grade_distribution": (_scored, _chart_runner("save_grade_distribution")),
+	"pdf": (_scored, _run_pdf),
+}
+
+
+# Import every module the stages use so import time is not counted as stage time
+def _warm_imports():
+	import seaborn  # noqa: F401  (imported lazily by the chart functions)
+	import modules.charts, modules.pdfgenerator, modules.report, modules.stats, utils.file_utils  # noqa: F401
+
+
+# Peak resident set size of this process in MB (None where it cannot be read, e.g. Windows)
+def _peak_rss_mb():
+	from modules.instrumentation import _peak_rss_bytes
+	peak = _peak_rss_bytes()
+	return None if peak is None else peak / (1024 * 1024)
+
+
+# Measure one stage in the current (fresh) process and send the result back
+def _measure(stage, rows, repeat, conn):
+	try:
+		setup, run = STAGES[stage]
+		_warm_imports()
+		arg = setup(rows)
+		rss_before = _peak_rss_mb()
+
+		# Timing passes without tracing overhead
+		times = []
+		for _ in range(repeat):
+			start = time.perf_counter()
+			run(arg)
+			times.append(time.perf_counter() - start)
+		peak_rss = _peak_rss_mb()
+
+		# One traced pass for the Python allocation peak
+		tracemalloc.start()
+		run(arg)
+		_, alloc_peak = tracemalloc.get_traced_memory()
+		tracemalloc.stop()
+
+		conn.send({
+			"stage": stage,
+			"rows": rows,
+			"wall_s": min(times),
+			"peak_rss_mb": None if peak_rss is None else round(peak_rss, 1),
+			"rss_delta_mb": None if peak_rss is None else round(peak_rss - rss_before, 1),
+			"alloc_peak_mb": round(alloc_peak / (1024 * 1024), 1),
+		})
+	except Exception as e:
+		conn.send({"stage": stage, "rows": rows, "error": f"{type(e).__name__}: {e}"})
+	finally:
+		conn.close()
+
+
+# Run one stage in a fresh spawned process and return its measurements
+def run_stage(stage, rows, repeat=3):
+	context = multiprocessing.get_context("spawn")
+	receiver, sender = context.Pipe(duplex=False)
+	process = context.Process(target=_measure, args=(stage, rows, repeat, sender))
+	process.start()
+	sender.close()
+	try:
+		result = receiver.recv()
+	except EOFError:
+		result = {"stage": stage, "rows": rows, "error": f"process exited with code {process.exitcode}"}
+	process.join()
+	return result
+
+
+# Run every requested stage for every size, skipping sizes above the stage limit
+def run_benchmarks(sizes, stages, repeat=3, limits=None, progress=print):
+	limits = {**STAGE_LIMITS, **(limits or {})}
+	results = []
+	for rows in sizes:
+		for stage in stages:
+			if rows > limits.get(stage, float("inf")):
+				continue
+			result = run_stage(stage, rows, repeat)
+			results.append(result)
+			if progress is not None:
+				progress(_format_result(result))
+	return {
+		"meta": {
+			"timestamp": datetime.now(timezone.utc).isoformat(),
+			"python": platform.python_version(),
+			"platform": platform.platform(),
+			"versions": _versions(),
+		},
+		"results": results,
+	}
+
+
+# Versions of the libraries that dominate the measured stages
+def _versions():
+	versions = {}
+	for name in ("numpy", "pandas", "matplotlib", "seaborn", "reportlab"):
+		try:
+			versions[name] = __import__(name).__version__
+		except Exception:
+			versions[name] = None
+	return versions
+
+
+# One line of human-readable output per result
+def _format_result(result):
+	if "error" in result:
+		return f"{result['stage']:<26} {result['rows']:>11,}  ERROR {result['error']}"
+	rss = "       n/a" if result["peak_rss_mb"] is None else f"{result['peak_rss_mb']:>8.1f}MB"
+	return (f"{result['stage']:<26} {result['rows']:>11,}  {result['wall_s']:>9.3f}s"
+			f"  rss {rss}  alloc {result['alloc_peak_mb']:>8.1f}MB")
+
+
+# Compare results with a baseline; returns a list of regression messages
+# A metric regresses when it is more than threshold (e.g. 0.2 = 20%) above the baseline
+def compare(results, baseline, threshold=0.2, metrics=("wall_s", "alloc_peak_mb")):
+	previous = {(r["stage"], r["rows"]): r for r in baseline["results"] if "error" not in r}
+	regressions = []
+	for result in results["results"]:
+		old = previous.get((result["stage"], result["rows"]))
+		if old is None or "error" in result:
+			continue
+		for metric in metrics:
+			if old[metric] > 0 and result[metric] > old[metric] * (1 + threshold):
+				regressions.append(
+					f"{result['stage']} @ {result['rows']:,} rows: {metric} "
+					f"{old[metric]:.3f} -> {result[metric]:.3f} (+{result[metric] / old[metric] - 1:.0%})")
+	return regressions
+
+
+# Parse "stage=rows,stage=rows" limit overrides
+def _parse_limits(text):
+	limits = {}
+	for item in filter(None, text.split(",")):
+		stage, rows = item.split("=")
+		limits[stage] = int(rows)
+	return limits
+
+
+# Command-line entry point
+def main(argv=None):
+	parser = argparse.ArgumentParser(description="Benchmark the student report pipeline stages")
+	parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+						help="comma-separated cohort sizes")
+	parser.add_argument("--stages", default=",".join(STAGES), help="comma-separated stages to run")
+	parser.add_argument("--repeat", type=int, default=3, help="timing runs per stage (best is kept)")
+	parser.add_argument("--limits", default="", help="per-stage row limits, e.g. pdf=1000000")
+	parser.add_argument("--output", default="benchmark_results.json", help="where to write the results")
+	parser.add_argument("--baseline", help="baseline results JSON to compare against")
+	parser.add_argument("--threshold", type=float, default=0.2,
+						help="allowed slowdown before a regression is reported (0.2 = 20%%)")
+	args = parser.parse_args(argv)
+
+	stages = args.stages.split(",")
+	unknown = [stage for stage in stages if stage not in STAGES]
+	if unknown:
+		parser.error(f"unknown stages: {', '.join(unknown)}")
+
+	results = run_benchmarks([int(size) for size in args.sizes.split(",")], stages,
+							 repeat=args.repeat, limits=_parse_limits(args.limits))
+	with open(args.output, "w", encoding="utf-8") as f:
+		json.dump(results, f, indent=2)
+	print(f"Results written to {args.output}")
+
+	if args.baseline:
+		with open(args.baseline, encoding="utf-8") as f:
+			baseline = json.load(f)
+		regressions = compare(results, baseline, args.threshold)
+		for message in regressions:
+			print(f"REGRESSION {message}")
+		if regressions:
+			return 1
+		print(f"No regressions above {args.threshold:.0%}")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,209 @@
+# Command-line entry point for running the student report pipeline without the web UI
+# Only the standard library is imported up front; pandas, matplotlib, seaborn and
+# reportlab load inside the command (and stage) that needs them
+import argparse  # For parsing command-line arguments
+import os        # For output paths
+import sys       # For progress output and exit codes
+
+
+# Print batch progress on a single updating line
+def print_progress(done, total, group):
+	if group is not None:
+		print(f"\r[{done}/{total}] {group}", end="", file=sys.stderr, flush=True)
+	if done == total:
+		print(file=sys.stderr)
+
+
+# Load the subject schema given with --schema (None = default subjects)
+def load_schema(path):
+	if not path:
+		return None
+	from modules.schema import SubjectSchema
+	return SubjectSchema.from_json(path)
+
+
+# Run the "report" command: CSV -> scoring -> summary -> charts -> PDF/CSV
+def run_report(args):
+	from modules.instrumentation import PipelineTimer
+	from modules.pipeline import run_pipeline
+	from utils.file_utils import FORMAT_DETAILS, export_dataframe
+
+	timer = PipelineTimer(enabled=args.timings or bool(args.metrics_file))
+
+	# CSVValidationError (bad file), ValueError (bad marks or schema) are reported, not raised
+	try:
+		result = run_pipeline(args.input, render_charts=not args.no_charts,
+							  build_pdf=not args.no_pdf, max_workers=args.workers, timer=timer,
+							  schema=load_schema(args.schema), quarantine=args.quarantine,
+							  max_errors=args.max_errors)
+	except ValueError as e:
+		print(f"error: {e}", file=sys.stderr)
+		report = getattr(e, "report", None)
+		if report is not None:
+			print(report.errors.to_string(index=False), file=sys.stderr)
+			if report.truncated:
+				print(f"... {report.error_count - len(report.errors)} more", file=sys.stderr)
+		return 2
+
+	# Write the analyzed data, the summary, the charts and the PDF into the output directory
+	os.makedirs(args.out, exist_ok=True)
+	export_dataframe(result["df"], args.format, os.path.join(args.out, FORMAT_DETAILS[args.format][1]))
+	result["summary"].to_csv(os.path.join(args.out, "summary.csv"))
+	for name, png in result["charts"].items():
+		with open(os.path.join(args.out, f"{name}.png"), "wb") as f:
+			f.write(png)
+	if result["pdf"] is not None:
+		with open(os.path.join(args.out, "student_report.pdf"), "wb") as f:
+			f.write(result["pdf"])
+	print(f"{len(result['df'])} students written to {args.out}")
+
+	# Quarantined rows and the problems found in them
+	report = result["validation"]
+	if not report.ok:
+		result["quarantined"].to_csv(os.path.join(args.out, "quarantined_rows.csv"), index_label="row")
+		report.errors.to_csv(os.path.join(args.out, "validation_errors.csv"), index=False)
+		print(f"{report.bad_row_count} rows quarantined ({report.error_count} invalid values), "
+			  f"see quarantined_rows.csv and validation_errors.csv", file=sys.stderr)
+
+	# Report the stage timings
+	if args.timings:
+		print(timer.to_frame().to_string(index=False), file=sys.stderr)
+	if args.metrics_file:
+		timer.write_openmetrics(args.metrics_file)
+	return 0
+
+
+# Run the "batch" command: one PDF per group in the output directory
+def run_batch(args):
+	import pandas as pd
+	from modules.batch import generate_section_reports
+
+	try:
+		schema = load_schema(args.schema)
+	except ValueError as e:
+		print(f"error: {e}", file=sys.stderr)
+		return 2
+
+	df = pd.read_csv(args.input)
+	manifest = generate_section_reports(
+		df, args.group_by, args.out, max_workers=args.workers,
+		progress=None if args.quiet else print_progress, rows_per_page=args.rows_per_page,
+		schema=schema)
+	print(f"{len(manifest['completed'])} reports in {args.out}, {len(manifest['failed'])} failed")
+	for group, error in manifest["failed"].items():
+		print(f"  {group}: {error}", file=sys.stderr)
+	return 1 if manifest["failed"] else 0
+
+
+# Roll numbers on the command line are numbers when they look like one
+def parse_roll_no(value):
+	try:
+		return int(value)
+	except ValueError:
+		return value
+
+
+# Counts on the command line that may be zero but not negative
+def non_negative_int(value):
+	number = int(value)
+	if number < 0:
+		raise argparse.ArgumentTypeError(f"must be 0 or more, not {number}")
+	return number
+
+
+# Run the "history" command: store a scored term and query trends across terms
+def run_history(args):
+	import pandas as pd
+	from modules.history import TermStore
+
+	with TermStore(args.db) as store:
+		# Score and store a new term first, so the queries below include it
+		if args.add:
+			from modules.report import StudentReport
+			from utils.file_utils import read_and_validate_csv
+			try:
+				schema = load_schema(args.schema)
+				df = read_and_validate_csv(args.add, schema=schema)
+				scored = StudentReport(df, batch=True, schema=schema).to_dataframe()
+				store.add_term(args.term, scored, schema=schema, replace=args.replace)
+			except ValueError as e:
+				print(f"error: {e}", file=sys.stderr)
+				return 2
+			print(f"{len(scored)} students stored for term {args.term}")
+
+		with pd.option_context("display.width", 200, "display.max_columns", None):
+			if args.means:
+				print(store.cohort_means().to_string(index=False))
+			for roll_no in args.student or []:
+				print(store.trajectory(roll_no).to_string(index=False))
+			if args.decliners:
+				try:
+					print(store.largest_decliners(n=args.decliners).to_string(index=False))
+				except ValueError as e:
+					print(f"error: {e}", file=sys.stderr)
+					return 2
+		if args.chart:
+			from modules.charts import save_multi_term_gpa_chart
+			save_multi_term_gpa_chart(store.gpa_history(), args.chart, roll_nos=args.student)
+			print(f"chart written to {args.chart}")
+	return 0
+
+
+# Build the argument parser with one sub-command per entry point
+def build_parser():
+	parser = argparse.ArgumentParser(description="Student Performance Analysis System")
+	commands = parser.add_subparsers(dest="command", required=True)
+
+	report = commands.add_parser("report", help="analyze one CSV file and write CSV, charts and PDF")
+	report.add_argument("input", help="CSV, Parquet or Feather file with student marks")
+	report.add_argument("--format", choices=["csv", "parquet", "feather"], default="csv",
+						help="format of the analyzed data file")
+	report.add_argument("--out", required=True, help="output directory")
+	report.add_argument("--no-charts", action="store_true", help="skip chart rendering")
+	report.add_argument("--no-pdf", action="store_true", help="skip the PDF report")
+	report.add_argument("--workers", type=int, default=None, help="chart rendering processes (default: serial)")
+	report.add_argument("--timings", action="store_true", help="print per-stage timings")
+	report.add_argument("--metrics-file", help="write per-stage metrics in OpenMetrics text format")
+	report.add_argument("--schema", help="JSON file with the subjects, weights and grade cut-offs")
+	report.add_argument("--quarantine", action="store_true",
+						help="skip rows with invalid values (written to quarantined_rows.csv) instead of failing")
+	report.add_argument("--max-errors", type=non_negative_int, default=1000, help="invalid values listed in the error report")
+	report.set_defaults(func=run_report)
+
+	batch = commands.add_parser("batch", help="write one PDF report per class section")
+	batch.add_argument("input", help="CSV file with student marks")
+	batch.add_argument("--group-by", required=True, help="column to group sections by, e.g. section")
+	batch.add_argument("--out", required=True, help="output directory for the PDFs and manifest")
+	batch.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+	batch.add_argument("--rows-per-page", type=int, default=None, help="students per page in the PDF tables")
+	batch.add_argument("--schema", help="JSON file with the subjects, weights and grade cut-offs")
+	batch.add_argument("--quiet", action="store_true", help="do not print progress")
+	batch.set_defaults(func=run_batch)
+
+	history = commands.add_parser("history", help="store scored terms and query trends across them")
+	history.add_argument("--db", required=True, help="SQLite file holding the terms (created if missing)")
+	history.add_argument("--add", metavar="FILE", help="CSV, Parquet or Feather file to score and store")
+	history.add_argument("--term", help="name of the term being added, e.g. 2025-T1")
+	history.add_argument("--replace", action="store_true", help="overwrite the term if it is already stored")
+	history.add_argument("--schema", help="JSON file with the subjects, weights and grade cut-offs")
+	history.add_argument("--means", action="store_true", help="print the cohort means per term")
+	history.add_argument("--student", type=parse_roll_no, action="append",
+						 help="print a student's GPA per term (repeatable)")
+	history.add_argument("--decliners", type=int, metavar="N",
+						 help="print the N largest GPA drops between the last two terms")
+	history.add_argument("--chart", metavar="PNG", help="write the multi-term GPA chart")
+	history.set_defaults(func=run_history)
+	return parser
+
+
+# Parse arguments and run the selected command
+def main(argv=None):
+	parser = build_parser()
+	args = parser.parse_args(argv)
+	if args.command == "history" and args.add and not args.term:
+		parser.error("--add needs --term")
+	return args.func(args)
+
+
+if __name__ == "__main__":
+	sys.exit(main())
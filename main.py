@@ -1,76 +1,271 @@
 # Import required libraries for the Streamlit web application
 import streamlit as st  # For building the interactive web interface
 import pandas as pd     # For data manipulation and analysis
-import tempfile, os     # For temporary file handling and path operations
-from io import StringIO # For in-memory string operations (CSV downloads)
+import os               # For reading the cache directory setting
+import time             # For polling the report queue
+import uuid             # For identifying sessions to the report queue
 
-# Import custom modules from the project package
-from project.modules.report import StudentReport           # For processing student data
-from project.modules.pdfgenerator import PDFReportGenerator # For generating PDF reports
-from project.modules import charts                         # For creating data visualizations
-from project.utils.file_utils import read_and_validate_csv # For CSV file validation
+# Import the shared core package (modules/ and utils/), also used by the standalone app and the CLI
+from utils.file_utils import stream_and_score_csv  # For chunked ingestion of large files
+from utils.file_utils import detect_format, export_dataframe, FORMAT_DETAILS  # For Parquet/Feather support
+from modules.cache import ResultCache  # For caching results across reruns
+from modules.instrumentation import PipelineTimer  # For per-stage diagnostics
+from modules.schema import SubjectSchema  # For custom subjects and grade cut-offs
+from modules.query import StudentIndex  # For search, filters and pagination
+from modules.jobs import JobQueue, QueueFullError, FAILED, job_key  # For background report builds
+from modules.stats import HistogramSummary  # For percentile ranks and grade what-ifs
+from modules.charts import CHART_TITLES  # For the chart captions
 
 
 # Configure the Streamlit page settings and create the main UI
 st.set_page_config(page_title="Student Performance Dashboard", layout="wide")
 st.title("📊 Student Performance Analysis System")
-st.write("Upload a CSV file of student marks and explore insights!")
+st.write("Upload a CSV, Parquet or Feather file of student marks and explore insights!")
 
-# Create a file uploader widget for CSV files
-uploaded_file = st.file_uploader("Upload students.csv", type=["csv"])
+# Create a file uploader widget for CSV and columnar (Parquet, Arrow IPC / Feather) files
+uploaded_file = st.file_uploader("Upload students.csv", type=["csv", "parquet", "pq", "feather", "arrow"])
 
+# Streaming mode reads large files in chunks and keeps only running aggregates
+streaming_mode = st.sidebar.checkbox("Large file mode (streaming)", value=False,
+									 help="CSV files only; Parquet and Feather already load just the needed columns")
+chunk_size = st.sidebar.number_input("Rows per chunk", min_value=1_000, value=50_000, step=10_000)
+
+# Optional subject schema (JSON) with the subjects, weights, mark ranges and grade
+# cut-offs; without one the default math / science / english scheme is used
+schema_file = st.sidebar.file_uploader("Subject schema (JSON)", type=["json"])
+schema = None
+if schema_file:
+	try:
+		schema = SubjectSchema.from_json(schema_file)
+	except ValueError as e:
+		st.sidebar.error(f"Invalid subject schema: {e}")
+		st.stop()
+	st.sidebar.caption("Subjects: " + ", ".join(subject.label for subject in schema.subjects))
+
+# Quarantine mode sets rows with invalid values aside and reports on the rest,
+# instead of rejecting the whole upload
+quarantine = st.sidebar.checkbox("Quarantine invalid rows", value=False,
+								 help="Score the valid rows and list the rejected ones with their problems")
+
+# Format used for the analyzed data download
+export_format = st.sidebar.selectbox("Download format", list(FORMAT_DETAILS),
+									 format_func=lambda fmt: FORMAT_DETAILS[fmt][0])
+
+# Per-stage instrumentation: shown in a diagnostics panel and/or written as OpenMetrics
+# text to STUDENT_REPORT_METRICS_FILE for a Prometheus-compatible scraper. When both
+# are off the timer is disabled and costs next to nothing. Tracing memory records each
+# stage's peak Python allocations (peak_memory_bytes) at the cost of slower stages
+show_diagnostics = st.sidebar.checkbox("Show diagnostics", value=False)
+trace_memory = st.sidebar.checkbox("Trace memory per stage", value=False,
+								   help="Record each stage's peak memory (slower)")
+metrics_file = os.environ.get("STUDENT_REPORT_METRICS_FILE")
+timer = PipelineTimer(enabled=show_diagnostics or bool(metrics_file), trace_memory=trace_memory)
+
+
+# Share one result cache across reruns and sessions; set STUDENT_REPORT_CACHE_DIR
+# to also keep results on disk so they survive restarts
+@st.cache_resource
+def get_result_cache():
+	return ResultCache(disk_dir=os.environ.get("STUDENT_REPORT_CACHE_DIR"))
+
+
+# Downloads in each format, cached apart from the results (key: result key and format)
+# so their bytes count against their own memory bound
+@st.cache_resource
+def get_export_cache():
+	return ResultCache(max_entries=16, max_bytes=256 * 1024 * 1024)
+
+
+# Share one bounded report queue across sessions so simultaneous uploads wait their
+# turn instead of all building at once; STUDENT_REPORT_JOB_WORKERS sets how many
+# reports are built concurrently
+@st.cache_resource
+def get_job_queue():
+	return JobQueue(max_workers=int(os.environ.get("STUDENT_REPORT_JOB_WORKERS", "2")),
+					cache=get_result_cache())
+
+
+# List the problems found by validation: counts per column and reason, then the cells
+def show_validation_report(report):
+	st.dataframe(report.counts, hide_index=True)
+	if report.truncated:
+		st.caption(f"Showing the first {len(report.errors):,} of {report.error_count:,} problems")
+	st.dataframe(report.errors, hide_index=True)
+
+
+# Identify this browser session to the queue (for its per-user limit)
+session_id = st.session_state.setdefault("session_id", uuid.uuid4().hex)
+
+
+# Streaming application logic - validate and score the file chunk by chunk
+if uploaded_file and streaming_mode and detect_format(uploaded_file) == "csv":
+	try:
+		with timer.stage("streaming_ingestion", bytes_in=uploaded_file.size) as record:
+			summary, bad_rows = stream_and_score_csv(uploaded_file, chunksize=int(chunk_size), schema=schema)
+			record["rows"] = summary.count + summary.rejected
+	except ValueError as e:
+		st.error(str(e))
+		st.stop()
+
+	# Show the running summary statistics and grade distribution
+	st.subheader("📊 Summary Statistics")
+	st.write(summary.to_frame())
+	st.bar_chart(summary.grade_distribution())
+
+	# Report rejected rows with their CSV line numbers instead of stopping the upload
+	if summary.rejected:
+		st.warning(f"{summary.rejected} rows were skipped because they failed validation")
+		st.dataframe(pd.DataFrame(bad_rows))
 
 # Main application logic - execute only when a file is uploaded
-if uploaded_file:
-	# Step 1: Read and validate the uploaded CSV file
-	df = read_and_validate_csv(uploaded_file)
-	
-	# Step 2: Process the raw data through the StudentReport class
-	# This validates marks, calculates GPAs, and assigns grades
-	report = StudentReport(df)
-	df = report.to_dataframe()  # Get enhanced DataFrame with GPA and grades
-
-	# Step 3: Display the processed student data in a table
+elif uploaded_file:
+	# Look up this upload in the result cache by a hash of its bytes so reruns
+	# triggered by widget interactions skip the whole pipeline; the schema and the
+	# quarantine mode are part of the key because they change the result
+	cache = get_result_cache()
+	with timer.stage("cache_lookup", bytes_in=uploaded_file.size):
+		cache_key = job_key(uploaded_file.getvalue(), schema_file.getvalue() if schema_file else b"", quarantine)
+		result = cache.get(cache_key)
+
+	if result is None:
+		# Hand the upload to the shared queue, which validates the file, scores the
+		# students, renders the charts and builds the PDF in the background; identical
+		# uploads from other sessions share one job
+		queue = get_job_queue()
+		job = queue.get(st.session_state.get("job_id"))
+		if job is None or job.key != cache_key:
+			try:
+				job = queue.submit(session_id, uploaded_file.getvalue(), uploaded_file.name, schema=schema,
+								   schema_bytes=schema_file.getvalue() if schema_file else b"",
+								   quarantine=quarantine, trace_memory=timer.enabled and trace_memory)
+			except QueueFullError as e:
+				st.warning(str(e))
+				st.stop()
+			st.session_state["job_id"] = job.id
+
+		# Show progress and poll until the report is ready
+		if job.active:
+			ahead = queue.position(job)
+			if ahead:
+				st.info(f"⏳ Waiting in queue ({ahead} report{'s' if ahead != 1 else ''} ahead)...")
+			else:
+				st.info(f"⚙️ Building report: {(job.stage or 'starting').replace('_', ' ')}...")
+			time.sleep(1)
+			st.rerun()
+
+		# Validation problems are reported by the job; list every invalid cell and stop
+		if job.status == FAILED:
+			st.error(job.error)
+			if job.report is not None:
+				show_validation_report(job.report)
+				st.info("Fix these cells and upload again, or turn on quarantine mode to skip the rows.")
+			st.stop()
+
+		result = job.result
+		if timer.enabled and st.session_state.get("timed_job") != job.id:
+			timer.records.extend(job.timer.records)  # Report the build's stages once
+			st.session_state["timed_job"] = job.id
+
+	# The queue indexes every result it builds; results cached on disk before indexing
+	# and histogram summaries existed get them here once and are stored again
+	# (as a new dict: the cached one may be in use by other sessions)
+	if "index" not in result or "stats" not in result:
+		with timer.stage("index", rows=len(result["df"])):
+			stats = HistogramSummary.for_schema(schema)
+			stats.update(result["df"])
+			result = {**result, "index": StudentIndex(result["df"]), "stats": stats}
+		cache.put(cache_key, result)
+
+	df = result["df"]
+	index = result["index"]
+	stats = result["stats"]
+
+	# Quarantined rows: say how many were set aside, why, and offer them for download
+	report = result.get("validation")
+	if report is not None and not report.ok:
+		st.warning(f"{report.bad_row_count:,} rows were quarantined ({report.error_count:,} invalid values); "
+				   f"the report below covers the remaining {len(df):,} students")
+		with st.expander("🚫 Quarantined rows"):
+			show_validation_report(report)
+			st.download_button("📥 Download quarantined rows (CSV)", export_dataframe(result["quarantined"], "csv"),
+							   file_name="quarantined_rows.csv", mime="text/csv")
+
+	# Step 1: Display the processed student data, one page at a time
+	# Search, filters and paging run against the index on the server, so only the
+	# visible page is sent to the browser
 	st.subheader("📌 Student Data")
-	st.dataframe(df)  # Interactive table showing all student information
+	search_col, gpa_col, grade_col = st.columns([2, 2, 1])
+	search = search_col.text_input("Search by roll number or name")
+	gpa_low, gpa_high = stats.ranges[stats.columns.index("GPA")]  # 0 to the schema's GPA scale
+	gpa_range = gpa_col.slider("GPA range", gpa_low, gpa_high, (gpa_low, gpa_high), step=0.05)
+	grade_filter = grade_col.multiselect("Grades", sorted(df["Grade"].unique()))
+
+	with timer.stage("query", rows=len(df)) as record:
+		matches = index.query(search=search or None,
+							  gpa_min=gpa_range[0] if gpa_range[0] > gpa_low else None,
+							  gpa_max=gpa_range[1] if gpa_range[1] < gpa_high else None,
+							  grades=grade_filter or None)
+		record["rows"] = len(matches)
 
-	# Step 4: Provide CSV download functionality for the analyzed data
-	csv_buffer = StringIO()  # Create in-memory string buffer
-	df.to_csv(csv_buffer, index=False)  # Convert DataFrame to CSV format
-	st.download_button("📥 Download Analyzed Data (CSV)", csv_buffer.getvalue(),
-					  file_name="analyzed_students.csv", mime="text/csv")
+	sort_col, order_col, size_col, page_col = st.columns(4)
+	sort_by = sort_col.selectbox("Sort by", ["roll order", "GPA", "name", "roll_no"])
+	descending = order_col.checkbox("Descending", value=sort_by == "GPA")
+	page_size = size_col.selectbox("Rows per page", [25, 50, 100, 500], index=1)
+	page_count = max(1, -(-len(matches) // page_size))
+	page = page_col.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1)
 
-	# Step 5: Generate and display summary statistics
+	page_df, _ = index.page(matches, page=int(page), page_size=page_size,
+							sort_by=None if sort_by == "roll order" else sort_by,
+							ascending=not descending)
+	# Percentile ranks come from the GPA histogram, so only the visible rows are ranked
+	page_df = page_df.assign(**{"GPA percentile": stats.percentile_rank("GPA", page_df["GPA"]).round(1)})
+	st.caption(f"{len(matches):,} of {len(df):,} students match")
+	st.dataframe(page_df)  # Only the current page is sent to the browser
+
+	# Step 2: Provide download functionality for the analyzed data in the chosen format
+	# Each format is exported once per result and cached, so reruns reuse the bytes
+	label, file_name, mime = FORMAT_DETAILS[export_format]
+	export_cache = get_export_cache()
+	export_key = f"{cache_key}-{export_format}"
+	export_data = export_cache.get(export_key)
+	if export_data is None:
+		with timer.stage("export", rows=len(df)) as record:
+			export_data = export_dataframe(df, export_format)
+			record["bytes_out"] = len(export_data)
+		export_cache.put(export_key, export_data)
+	st.download_button(f"📥 Download Analyzed Data ({label})", export_data,
+					  file_name=file_name, mime=mime)
+
+	# Step 3: Display summary statistics
 	st.subheader("📊 Summary Statistics")
-	summary = df.describe()  # Calculate statistical summary (mean, std, min, max, etc.)
-	st.write(summary)        # Display the summary table
+	st.write(result["summary"])  # Display the summary table
 
-	# Step 6: Create visualizations and generate PDF report
+	# Grade boundary what-if: recount grades from the GPA histogram for a moved cut-off
+	with st.expander("🎚️ Grade boundary what-if"):
+		boundary_col, shift_col = st.columns(2)
+		boundary = boundary_col.selectbox("Grade cut-off", [grade for grade, _ in stats.grade_thresholds])
+		shift = shift_col.slider("Move cut-off by (GPA)", -0.5, 0.5, 0.1, step=0.01)
+		st.dataframe(stats.threshold_shift(boundary, shift))
+
+	# Step 4: Show the charts and provide the PDF download button
+	# The PNGs were rendered once by the pipeline and are the same images embedded in the PDF
 	st.subheader("📈 Visualizations")
-	chart_files = []  # List to store file paths of generated charts
-	
-	# Use temporary directory to store chart images (automatically cleaned up)
-	with tempfile.TemporaryDirectory() as tmp_dir:
-		# Define file paths for each chart type
-		avg_file = os.path.join(tmp_dir, "avg.png")        # Average marks per subject
-		gpa_file = os.path.join(tmp_dir, "gpa.png")        # GPA trend by roll number
-		heatmap_file = os.path.join(tmp_dir, "heatmap.png") # Correlation heatmap
-		grade_file = os.path.join(tmp_dir, "grade.png")     # Grade distribution
-
-		# Generate all charts and add their file paths to the list
-		charts.save_avg_subject_chart(df, avg_file); chart_files.append(avg_file)
-		charts.save_gpa_trend_chart(df, gpa_file); chart_files.append(gpa_file)
-		charts.save_heatmap(df, heatmap_file); chart_files.append(heatmap_file)
-		charts.save_grade_distribution(df, grade_file); chart_files.append(grade_file)
-
-		# Step 7: Generate comprehensive PDF report
-		pdf_gen = PDFReportGenerator(df, summary, chart_files)
-		pdf_buffer = pdf_gen.generate()  # Create PDF in memory
-		
-		# Provide PDF download button
-		st.download_button("📑 Download PDF Report", pdf_buffer,
-						  file_name="student_report.pdf", mime="application/pdf")
-		# Note: Temporary files are automatically deleted when exiting this block
+	chart_columns = st.columns(2)
+	for i, (name, png) in enumerate(result["charts"].items()):
+		chart_columns[i % 2].image(png, caption=CHART_TITLES.get(name, name))
+	st.download_button("📑 Download PDF Report", result["pdf"],
+					  file_name="student_report.pdf", mime="application/pdf")
 else:
 	# Display instructions when no file is uploaded
-	st.info("👆 Upload a CSV file to get started.")
\ No newline at end of file
+	st.info("👆 Upload a CSV, Parquet or Feather file to get started.")
+
+# Report the stage timings of this run (nothing is recorded when the timer is disabled)
+if timer.records:
+	timer.log()  # Structured JSON log line per stage
+	if metrics_file:
+		timer.write_openmetrics(metrics_file)
+	if show_diagnostics:
+		with st.expander("🔧 Diagnostics", expanded=True):
+			st.write(f"Total: {timer.total_seconds():.3f}s")
+			st.dataframe(timer.to_frame())
+			st.code(timer.to_openmetrics(), language="text")
@@ -0,0 +1,29 @@
+# Core package shared by every front-end (main.py, student_performance_analysis_system.py
+# and cli.py): scoring, summaries, charts, PDF reports, caching and the report queue
+# The names below are the stable API; charts, pdfgenerator and jobs are left to be
+# imported directly so importing the package never loads matplotlib or reportlab
+from .schema import Subject, SubjectSchema, DEFAULT_SCHEMA  # Subjects, weights and grade cut-offs
+from .student import Student  # Single-student validation, GPA and grade
+from .report import StudentReport, score_dataframe, SUBJECTS  # Vectorized scoring
+from .stats import RunningSummary, HistogramSummary  # Mergeable summary statistics
+from .cache import ResultCache, hash_bytes  # Result cache keyed on upload contents
+from .query import StudentIndex  # Search, filters and pagination
+
+__all__ = [
+	"Subject", "SubjectSchema", "DEFAULT_SCHEMA",
+	"Student",
+	"StudentReport", "score_dataframe", "SUBJECTS",
+	"RunningSummary", "HistogramSummary",
+	"ResultCache", "hash_bytes",
+	"StudentIndex",
+	"run_pipeline",
+]
+
+
+# run_pipeline (upload -> scoring -> summary -> charts -> PDF) is loaded on first use:
+# the pipeline imports utils.file_utils, which itself imports from this package
+def __getattr__(name):
+	if name == "run_pipeline":
+		from .pipeline import run_pipeline
+		return run_pipeline
+	raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
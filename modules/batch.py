@@ -0,0 +1,109 @@
+# Import required libraries for generating one PDF report per class section
+import json  # For the resumable run manifest
+import os    # For output paths and atomic file replacement
+import re    # For turning group values into safe file names
+from concurrent.futures import ProcessPoolExecutor, as_completed  # For fanning groups out
+
+from .report import StudentReport  # For validating and scoring each section
+from .stats import HistogramSummary  # For each section's summary table
+from .pdfgenerator import PDFReportGenerator  # For building each section's PDF
+from . import charts  # For rendering each section's charts
+
+
+# Name of the manifest file written into the output directory
+MANIFEST_NAME = "manifest.json"
+
+
+# Build the full report for one section and write it to path
+# Runs inside a worker process: scores the rows, renders the charts serially
+# (the pool already parallelizes across sections) and writes the PDF atomically
+def build_section_report(df, path, rows_per_page=None, schema=None):
+	scored = StudentReport(df, batch=True, schema=schema).to_dataframe()
+	stats = HistogramSummary.for_schema(schema)
+	stats.update(scored)
+	summary = stats.to_frame()
+	images = charts.render_all_charts(scored, max_workers=1, schema=schema)
+	tmp_path = path + ".tmp"
+	pdf_gen = PDFReportGenerator(scored, summary, images)
+	pdf_gen.generate(sink=tmp_path, rows_per_page=rows_per_page)
+	os.replace(tmp_path, path)
+	return os.path.basename(path)
+
+
+# Turn a group value into a file name, avoiding names already used in this run
+def _file_name(value, used):
+	base = re.sub(r"[^A-Za-z0-9_.-]+", "_", str(value)).strip("._") or "group"
+	name, n = f"{base}.pdf", 1
+	while name in used:
+		n += 1
+		name = f"{base}_{n}.pdf"
+	used.add(name)
+	return name
+
+
+# Load the manifest from a previous run, or start a new one
+def load_manifest(out_dir, group_column):
+	path = os.path.join(out_dir, MANIFEST_NAME)
+	if os.path.exists(path):
+		with open(path, encoding="utf-8") as f:
+			manifest = json.load(f)
+		if manifest.get("group_column") == group_column:
+			manifest.setdefault("failed", {})
+			return manifest
+	return {"group_column": group_column, "completed": {}, "failed": {}}
+
+
+# Write the manifest atomically so a crash never leaves it half-written
+def save_manifest(out_dir, manifest):
+	path = os.path.join(out_dir, MANIFEST_NAME)
+	with open(path + ".tmp", "w", encoding="utf-8") as f:
+		json.dump(manifest, f, indent=2)
+	os.replace(path + ".tmp", path)
+
+
+# Write one PDF per value of group_column into out_dir using a process pool
+# max_workers: number of worker processes (None = one per CPU)
+# progress: optional callback(done, total, group) called as each section finishes
+# schema: optional SubjectSchema used to score every section
+# The manifest in out_dir records finished and failed sections; sections already
+# finished (with their PDF still on disk) are skipped, so a crashed run can resume
+# Returns the manifest dict
+def generate_section_reports(df, group_column, out_dir, max_workers=None, progress=None,
+							 rows_per_page=None, schema=None):
+	if group_column not in df.columns:
+		raise ValueError(f"Missing group column: {group_column}")
+	os.makedirs(out_dir, exist_ok=True)
+	manifest = load_manifest(out_dir, group_column)
+
+	# Work out which sections still need a report
+	used = set(manifest["completed"].values())
+	pending = {}
+	for value, group in df.groupby(group_column, sort=True):
+		key = str(value)
+		done = manifest["completed"].get(key)
+		if done and os.path.exists(os.path.join(out_dir, done)):
+			continue
+		manifest["completed"].pop(key, None)
+		pending[key] = (group, os.path.join(out_dir, _file_name(value, used)))
+
+	total = len(pending)
+	if progress is not None:
+		progress(0, total, None)
+	if not total:
+		return manifest
+
+	# Fan the sections out over the pool and record each result as it arrives
+	with ProcessPoolExecutor(max_workers=max_workers) as executor:
+		futures = {executor.submit(build_section_report, group, path, rows_per_page, schema): key
+				   for key, (group, path) in pending.items()}
+		for done, future in enumerate(as_completed(futures), start=1):
+			key = futures[future]
+			try:
+				manifest["completed"][key] = future.result()
+				manifest["failed"].pop(key, None)
+			except Exception as e:
+				manifest["failed"][key] = str(e)
+			save_manifest(out_dir, manifest)
+			if progress is not None:
+				progress(done, total, key)
+	return manifest
@@ -0,0 +1,153 @@
+# Import required libraries for caching pipeline results between Streamlit reruns
+import hashlib    # For hashing uploaded file contents into cache keys
+import os         # For the optional on-disk cache directory
+import pickle     # For storing cached results on disk
+import tempfile   # For atomic writes of on-disk cache entries
+import threading  # For sharing one cache safely between Streamlit sessions
+from collections import OrderedDict  # For least-recently-used ordering
+
+
+# Build a cache key from the raw bytes of an uploaded file
+def hash_bytes(data):
+	return hashlib.sha256(data).hexdigest()
+
+
+# Estimate how many bytes a cached result takes in memory
+# Results are dicts of DataFrames (df, summary), dicts of PNG bytes (charts) and bytes
+# (pdf); other objects report their size through a pandas-style memory_usage()
+# (StudentIndex, HistogramSummary, ValidationReport)
+def estimate_size(value):
+	if hasattr(value, "memory_usage"):
+		return int(value.memory_usage(deep=True).sum())
+	if isinstance(value, (bytes, bytearray)):
+		return len(value)
+	if isinstance(value, dict):
+		return sum(estimate_size(v) for v in value.values())
+	if isinstance(value, (list, tuple)):
+		return sum(estimate_size(v) for v in value)
+	return 64  # Small scalars and other objects
+
+
+# Size-bounded LRU cache of pipeline results keyed on the upload's content hash
+# The in-memory tier evicts least recently used entries once max_entries or max_bytes
+# is exceeded. When disk_dir is set, entries are also pickled there so the cache
+# survives process restarts; the disk tier is trimmed to max_disk_bytes (oldest first)
+class ResultCache:
+	# Initialize the cache with its memory bounds and optional disk directory
+	def __init__(self, max_entries=32, max_bytes=512 * 1024 * 1024, disk_dir=None,
+				 max_disk_bytes=2 * 1024 * 1024 * 1024):
+		self.max_entries = max_entries
+		self.max_bytes = max_bytes
+		self.disk_dir = disk_dir
+		self.max_disk_bytes = max_disk_bytes
+		self._entries = OrderedDict()  # key -> (result, size), least recently used first
+		self._bytes = 0
+		self._lock = threading.Lock()
+		if disk_dir:
+			os.makedirs(disk_dir, exist_ok=True)
+
+	# Number of entries held in memory
+	def __len__(self):
+		return len(self._entries)
+
+	# Return the cached result for key, or None on a miss
+	def get(self, key):
+		with self._lock:
+			if key in self._entries:
+				self._entries.move_to_end(key)  # Mark as most recently used
+				return self._entries[key][0]
+
+		# Fall back to the disk tier and promote hits into memory
+		result = self._read_disk(key)
+		if result is not None:
+			self._store(key, result)
+		return result
+
+	# Store a result in memory (and on disk when a disk directory is configured)
+	def put(self, key, result):
+		self._store(key, result)
+		self._write_disk(key, result)
+
+	# Drop every in-memory entry (the disk tier is left untouched)
+	def clear(self):
+		with self._lock:
+			self._entries.clear()
+			self._bytes = 0
+
+	# Insert into the in-memory LRU and evict until it fits its bounds
+	def _store(self, key, result):
+		size = estimate_size(result)
+		with self._lock:
+			if key in self._entries:
+				self._bytes -= self._entries.pop(key)[1]
+			# Results larger than the whole memory budget are only kept on disk
+			if size > self.max_bytes:
+				return
+			self._entries[key] = (result, size)
+			self._bytes += size
+			while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+				_, (_, evicted_size) = self._entries.popitem(last=False)
+				self._bytes -= evicted_size
+
+	# Path of the on-disk entry for key
+	def _disk_path(self, key):
+		return os.path.join(self.disk_dir, f"{key}.pkl")
+
+	# Load an entry from disk, returning None when missing or unreadable
+	# Entries that cannot be unpickled (truncated files, or pickles written by an older
+	# version whose classes have moved or gone) are deleted so the result is rebuilt
+	def _read_disk(self, key):
+		if not self.disk_dir:
+			return None
+		path = self._disk_path(key)
+		try:
+			with open(path, "rb") as f:
+				result = pickle.load(f)
+		except FileNotFoundError:
+			return None
+		except Exception:
+			try:
+				os.remove(path)
+			except OSError:
+				pass
+			return None
+		try:
+			os.utime(path)  # Refresh the modification time used for disk eviction
+		except OSError:
+			pass  # Trimmed by another session meanwhile; the loaded result is still valid
+		return result
+
+	# Write an entry to disk atomically, then trim the disk tier to its size limit
+	def _write_disk(self, key, result):
+		if not self.disk_dir:
+			return
+		fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+		try:
+			with os.fdopen(fd, "wb") as f:
+				pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+			os.replace(tmp_path, self._disk_path(key))
+		except OSError:
+			if os.path.exists(tmp_path):
+				os.remove(tmp_path)
+			return
+		self._trim_disk()
+
+	# Remove the oldest on-disk entries until the directory fits max_disk_bytes
+	def _trim_disk(self):
+		entries = []
+		for name in os.listdir(self.disk_dir):
+			if name.endswith(".pkl"):
+				try:
+					stat = os.stat(os.path.join(self.disk_dir, name))
+				except FileNotFoundError:
+					continue  # Removed by another session meanwhile
+				entries.append((stat.st_mtime, stat.st_size, name))
+		total = sum(size for _, size, _ in entries)
+		for _, size, name in sorted(entries):
+			if total <= self.max_disk_bytes:
+				break
+			try:
+				os.remove(os.path.join(self.disk_dir, name))
+			except FileNotFoundError:
+				pass
+			total -= size
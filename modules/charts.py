@@ -1,78 +1,286 @@
 # Import required libraries for data visualization
-import matplotlib.pyplot as plt  # For creating basic plots and charts
-import seaborn as sns  # For advanced statistical data visualization
+import multiprocessing  # For the worker processes' start method
+from concurrent.futures import ProcessPoolExecutor  # For rendering charts in parallel
+from io import BytesIO  # For returning rendered charts as in-memory image bytes
 
+from matplotlib.figure import Figure  # Figure API without pyplot's global state
+import numpy as np  # For binning and downsampling large series
+import pandas as pd  # For per-bin aggregates of large series
+# seaborn is imported inside the functions that use it: it is slow to import and
+# only the heatmap and grade distribution need it
 
-# Function to create and save a bar chart showing average marks per subject
-def save_avg_subject_chart(df, path):
-	# Calculate the mean (average) marks for math, science, and english columns
-	avg_per_subject = df[["math","science","english"]].mean()
-	
-	# Create a new figure and axis for the plot
-	fig, ax = plt.subplots()
+from .schema import DEFAULT_SCHEMA  # Subjects and grades the charts follow
+
+
+# Bar colors for the subjects, in order (repeated when there are more subjects)
+SUBJECT_COLORS = ["skyblue", "lightgreen", "salmon", "plum", "khaki", "lightcoral",
+				  "paleturquoise", "wheat", "lightsteelblue", "palegreen", "peachpuff", "thistle"]
+
+
+# Draw a bar chart showing average marks per subject onto the given axis
+# subjects: subject columns to plot (default: math, science, english)
+def _draw_avg_subject_chart(df, ax, subjects=None):
+	subjects = subjects or DEFAULT_SCHEMA.subject_names
+
+	# Calculate the mean (average) marks for every subject column
+	avg_per_subject = df[subjects].mean()
 	
 	# Create a bar chart with different colors for each subject
-	# skyblue for math, lightgreen for science, salmon for english
-	avg_per_subject.plot(kind="bar", color=["skyblue","lightgreen","salmon"], ax=ax)
-	
-	# Save the figure to the specified file path
-	fig.savefig(path)
-	
-	# Close the figure to free up memory
-	plt.close(fig)
+	# skyblue for math, lightgreen for science, salmon for english, and so on
+	colors = [SUBJECT_COLORS[i % len(SUBJECT_COLORS)] for i in range(len(subjects))]
+	avg_per_subject.plot(kind="bar", color=colors, ax=ax)
 
 
-# Function to create and save a line chart showing GPA trend by roll number
-def save_gpa_trend_chart(df, path):
-	# Create a new figure and axis for the plot
-	fig, ax = plt.subplots()
-	
-	# Plot a line chart with roll_no on x-axis and GPA on y-axis
-	# marker="o" adds circular markers at each data point
-	# color="purple" sets the line color to purple
-	ax.plot(df["roll_no"], df["GPA"], marker="o", color="purple")
-	
-	# Save the figure to the specified file path
-	fig.savefig(path)
-	
-	# Close the figure to free up memory
-	plt.close(fig)
+# Above this many students the GPA trend switches to its large-data mode
+LARGE_COHORT_THRESHOLD = 5_000
 
 
-# Function to create and save a correlation heatmap showing relationships between subjects and GPA
-def save_heatmap(df, path):
-	# Create a new figure and axis for the plot
-	fig, ax = plt.subplots()
-	
-	# Calculate correlation matrix between math, science, english, and GPA
+# Downsample a series to n_out points with Largest-Triangle-Three-Buckets (LTTB)
+# Keeps the first and last points and, per bucket, the point forming the largest
+# triangle with the previously kept point and the next bucket's average
+def _lttb(x, y, n_out):
+	n = len(x)
+	if n_out >= n or n_out < 3:
+		return x, y
+	edges = np.linspace(1, n - 1, n_out - 1).astype(int)  # Buckets between first and last
+	keep = np.empty(n_out, dtype=int)
+	keep[0], keep[-1] = 0, n - 1
+	for i in range(n_out - 2):
+		start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+		# Average of the next bucket (or the last point for the final bucket)
+		next_end = edges[i + 2] if i + 2 < len(edges) else n
+		avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+		prev_x, prev_y = x[keep[i]], y[keep[i]]
+		area = np.abs((prev_x - avg_x) * (y[start:end] - prev_y)
+					  - (prev_x - x[start:end]) * (avg_y - prev_y))
+		keep[i + 1] = start + int(np.argmax(area))
+	return x[keep], y[keep]
+
+
+# Draw a line chart showing GPA trend by roll number onto the given axis
+# Above max_points students, the points are aggregated so render time depends on
+# the figure's pixel width instead of the cohort size:
+#   mode="band" plots the per-bin mean GPA with a p10-p90 band
+#   mode="lttb" plots an LTTB downsample of the series with one point per pixel
+def _draw_gpa_trend_chart(df, ax, max_points=LARGE_COHORT_THRESHOLD, mode="band"):
+	if len(df) <= max_points:
+		# Plot a line chart with roll_no on x-axis and GPA on y-axis
+		# marker="o" adds circular markers at each data point
+		# color="purple" sets the line color to purple
+		ax.plot(df["roll_no"], df["GPA"], marker="o", color="purple")
+		return
+
+	# One bin (or kept point) per horizontal pixel of the figure
+	bins = max(int(ax.figure.get_figwidth() * ax.figure.dpi), 3)
+
+	# Order the series by roll number so bins cover consecutive students
+	# Numeric roll numbers are used as x positions; other IDs (e.g. "S00001") are
+	# sorted and the student's position in that order (0..n-1) is plotted instead
+	gpa = df["GPA"].to_numpy(dtype=float)
+	numeric = pd.api.types.is_numeric_dtype(df["roll_no"])
+	roll_no = df["roll_no"].to_numpy(dtype=float) if numeric else df["roll_no"].astype(str).to_numpy()
+	if not np.all(roll_no[1:] >= roll_no[:-1]):
+		order = np.argsort(roll_no, kind="stable")
+		roll_no, gpa = roll_no[order], gpa[order]
+	if not numeric:
+		roll_no = np.arange(len(gpa), dtype=float)
+		ax.set_xlabel("Student (in roll number order)")
+
+	if mode == "lttb":
+		x, y = _lttb(roll_no, gpa, bins)
+		ax.plot(x, y, color="purple", linewidth=0.8)
+	else:
+		# Equal-count bins over the sorted students
+		groups = pd.DataFrame({"roll_no": roll_no, "GPA": gpa}).groupby(np.arange(len(gpa)) * bins // len(gpa))
+		x = groups["roll_no"].mean()
+		ax.fill_between(x, groups["GPA"].quantile(0.1), groups["GPA"].quantile(0.9),
+						color="purple", alpha=0.25, linewidth=0, label="p10-p90")
+		ax.plot(x, groups["GPA"].mean(), color="purple", label="mean GPA")
+		ax.legend(loc="lower right")
+	ax.set_title(f"GPA trend ({len(gpa):,} students, {mode})")
+
+
+# Draw a correlation heatmap showing relationships between subjects and GPA
+# A precomputed correlation matrix (e.g. IncrementalReport.correlation()) can be passed
+def _draw_heatmap(df, ax, corr=None, subjects=None):
+	# Calculate correlation matrix between the subjects and GPA
 	# This shows how strongly each subject correlates with others and with GPA
-	corr = df[["math","science","english","GPA"]].corr()
+	import seaborn as sns  # For advanced statistical data visualization
+
+	if corr is None:
+		corr = df[(subjects or DEFAULT_SCHEMA.subject_names) + ["GPA"]].corr()
 	
 	# Create a heatmap using seaborn
-	# annot=True displays correlation values on each cell
+	# annot=True displays correlation values on each cell (too crowded past 8 columns)
 	# cmap="coolwarm" uses a blue-to-red color scheme (cool to warm colors)
-	sns.heatmap(corr, annot=True, cmap="coolwarm", ax=ax)
-	
-	# Save the figure to the specified file path
-	fig.savefig(path)
-	
-	# Close the figure to free up memory
-	plt.close(fig)
+	sns.heatmap(corr, annot=len(corr) <= 8, cmap="coolwarm", ax=ax)
 
 
-# Function to create and save a bar chart showing the distribution of grades
-def save_grade_distribution(df, path):
-	# Create a new figure and axis for the plot
-	fig, ax = plt.subplots()
-	
+# Draw a bar chart showing the distribution of grades onto the given axis
+# grades: optional order of the bars (best to worst); by default the order they appear in
+def _draw_grade_distribution(df, ax, grades=None):
+	import seaborn as sns  # For advanced statistical data visualization
+
 	# Create a count plot (bar chart) showing how many students got each grade
 	# x="Grade" means the x-axis shows different grades (A, B, C, D)
 	# data=df specifies the DataFrame to use
 	# palette="Set2" uses a predefined color palette for different bars
-	sns.countplot(x="Grade", data=df, palette="Set2", ax=ax)
-	
-	# Save the figure to the specified file path
-	fig.savefig(path)
-	
-	# Close the figure to free up memory
-	plt.close(fig)
\ No newline at end of file
+	sns.countplot(x="Grade", data=df, palette="Set2", order=grades, ax=ax)
+
+
+# Draw the GPA trend across terms onto the given axis
+# df: long frame with term, roll_no and GPA (e.g. TermStore.gpa_history()); an ordered
+# categorical "term" column keeps the terms in chronological order
+# The cohort is drawn as its mean GPA per term with a p10-p90 band, so the cost depends
+# on the number of terms, not students; roll_nos adds one line per listed student
+def _draw_multi_term_gpa_chart(df, ax, roll_nos=None):
+	groups = df.groupby("term", observed=True)["GPA"]
+	terms = [str(term) for term in groups.mean().index]
+	positions = np.arange(len(terms))
+	ax.fill_between(positions, groups.quantile(0.1), groups.quantile(0.9),
+					color="purple", alpha=0.25, linewidth=0, label="p10-p90")
+	ax.plot(positions, groups.mean(), marker="o", color="purple", label="mean GPA")
+
+	# Individual trajectories, placed on the same term positions
+	index = {term: i for i, term in enumerate(terms)}
+	for roll_no in roll_nos or []:
+		student = df[df["roll_no"] == roll_no]
+		ax.plot([index[str(term)] for term in student["term"]], student["GPA"],
+				marker=".", linewidth=1, label=f"roll {roll_no}")
+
+	ax.set_xticks(positions, terms, rotation=45 if len(terms) > 6 else 0)
+	ax.set_xlabel("Term")
+	ax.set_ylabel("GPA")
+	ax.legend(loc="lower right")
+
+
+# Every chart: name -> (drawing function, columns it needs given the subject columns)
+# Only the needed columns are sent to worker processes
+CHARTS = {
+	"avg_subject": (_draw_avg_subject_chart, lambda subjects: subjects),
+	"gpa_trend": (_draw_gpa_trend_chart, lambda subjects: ["roll_no", "GPA"]),
+	"heatmap": (_draw_heatmap, lambda subjects: subjects + ["GPA"]),
+	"grade_distribution": (_draw_grade_distribution, lambda subjects: ["Grade"]),
+}
+
+# Display titles for the charts, used as captions by the front-ends
+CHART_TITLES = {
+	"avg_subject": "Average Marks per Subject",
+	"gpa_trend": "GPA Trend by Roll No",
+	"heatmap": "Correlation Heatmap",
+	"grade_distribution": "Grade Distribution",
+}
+
+
+# Drawing options that make a chart follow a schema's subjects and grades
+def _schema_options(name, schema):
+	if schema is None:
+		return {}
+	if name in ("avg_subject", "heatmap"):
+		return {"subjects": schema.subject_names}
+	if name == "grade_distribution":
+		return {"grades": schema.grades}
+	return {}
+
+
+# Render one chart on a standalone Figure and save it to a path or file-like object
+# Using Figure instead of pyplot keeps rendering free of global state, so charts
+# can be drawn in several threads or processes at the same time
+# Extra keyword arguments are passed on to the chart's drawing function
+def _render(name, df, target, dpi="figure", fmt=None, **draw_kwargs):
+	draw, _ = CHARTS[name]
+	fig = Figure()
+	ax = fig.subplots()
+	draw(df, ax, **draw_kwargs)
+	fig.savefig(target, dpi=dpi, format=fmt)
+
+
+# Render one chart into image bytes (runs inside worker processes)
+def _render_bytes(name, df, dpi, fmt, draw_kwargs):
+	buffer = BytesIO()
+	_render(name, df, buffer, dpi=dpi, fmt=fmt, **draw_kwargs)
+	return buffer.getvalue()
+
+
+# Process pool for rendering charts
+# Charts are rendered from multithreaded servers (Streamlit, the job queue), where
+# forking can copy a lock held by another thread into the child and deadlock it, so
+# workers are started by a forkserver where the platform has one and spawned elsewhere
+def chart_process_pool(max_workers=None):
+	method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+	return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(method))
+
+
+# Render several charts and return their image bytes in memory
+# charts: chart names to render (default: all of CHARTS, in order)
+# dpi / fmt: defaults for every chart ("figure" dpi = matplotlib's default resolution)
+# options: per-chart overrides, e.g. {"heatmap": {"dpi": 200, "format": "svg"}};
+#          any other keys go to the drawing function, e.g. {"gpa_trend": {"mode": "lttb"}}
+# executor: a long-lived pool (e.g. chart_process_pool()) to render the charts on
+#           concurrently; without one they are rendered serially in this process,
+#           because starting worker processes (each importing matplotlib, pandas and
+#           seaborn) costs several times more than drawing the charts
+# max_workers: without an executor, start a pool of this many processes for this call
+#              only (worth it for very large cohorts; None or 1 renders serially)
+# schema: optional SubjectSchema whose subjects and grades the charts follow
+# Returns a dict of chart name -> image bytes, in the requested order
+def render_all_charts(df, charts=None, dpi="figure", fmt="png", options=None,
+					  max_workers=None, executor=None, schema=None):
+	charts = list(CHARTS) if charts is None else list(charts)
+	options = options or {}
+	subjects = (schema or DEFAULT_SCHEMA).subject_names
+
+	# Collect the arguments for every chart, slicing the frame to its columns
+	jobs = []
+	for name in charts:
+		_, columns = CHARTS[name]
+		opts = {**_schema_options(name, schema), **options.get(name, {})}
+		jobs.append((name, df[columns(subjects)], opts.pop("dpi", dpi), opts.pop("format", fmt), opts))
+
+	# Serial path: no pool start-up cost
+	if executor is None and (max_workers is None or max_workers <= 1):
+		return {job[0]: _render_bytes(*job) for job in jobs}
+
+	# Parallel path: one task per chart on a process pool
+	own_executor = executor is None
+	if own_executor:
+		executor = chart_process_pool(max_workers)
+	try:
+		futures = {job[0]: executor.submit(_render_bytes, *job) for job in jobs}
+		return {name: future.result() for name, future in futures.items()}
+	finally:
+		if own_executor:
+			executor.shutdown()
+
+
+# Function to create and save a bar chart showing average marks per subject
+# schema: optional SubjectSchema (default: math, science, english)
+def save_avg_subject_chart(df, path, schema=None):
+	_render("avg_subject", df, path, **_schema_options("avg_subject", schema))
+
+
+# Function to create and save a line chart showing GPA trend by roll number
+# Cohorts larger than max_points are drawn as aggregates (mode="band" or "lttb")
+def save_gpa_trend_chart(df, path, max_points=LARGE_COHORT_THRESHOLD, mode="band"):
+	_render("gpa_trend", df, path, max_points=max_points, mode=mode)
+
+
+# Function to create and save a line chart of the GPA trend across several terms
+# history: long frame of term, roll_no and GPA, e.g. TermStore.gpa_history()
+# roll_nos: optional students whose own trajectories are drawn over the cohort
+def save_multi_term_gpa_chart(history, path, roll_nos=None):
+	fig = Figure()
+	ax = fig.subplots()
+	_draw_multi_term_gpa_chart(history, ax, roll_nos=roll_nos)
+	fig.savefig(path, bbox_inches="tight")
+
+
+# Function to create and save a correlation heatmap showing relationships between subjects and GPA
+# corr: optional precomputed correlation matrix, skips computing it from df
+def save_heatmap(df, path, corr=None, schema=None):
+	_render("heatmap", df, path, corr=corr, **_schema_options("heatmap", schema))
+
+
+# Function to create and save a bar chart showing the distribution of grades
+def save_grade_distribution(df, path, schema=None):
+	_render("grade_distribution", df, path, **_schema_options("grade_distribution", schema))
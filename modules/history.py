@@ -0,0 +1,185 @@
+# Import required libraries for keeping scored results across terms
+import sqlite3  # For the embedded term store (standard library, single file)
+import time     # For recording when a term was added
+
+import pandas as pd  # For returning query results as DataFrames
+
+from .schema import DEFAULT_SCHEMA  # Subjects stored for each term
+
+
+# Tables and indexes of the store
+# terms:    one row per term, position gives the chronological order
+# students: one row per student per term (GPA and grade), keyed on (term, roll_no)
+#           with a second index on (roll_no, term) for per-student trajectories
+# marks:    one row per student, subject and term, so terms scored with different
+#           subject schemas can live side by side
+# term_summary: count / mean / min / max of GPA and every subject per term, computed
+#           when the term is added so cohort queries never scan the student rows
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS terms (
+	term TEXT PRIMARY KEY,
+	position INTEGER NOT NULL,
+	added_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS students (
+	term TEXT NOT NULL REFERENCES terms(term) ON DELETE CASCADE,
+	roll_no NOT NULL,
+	name TEXT,
+	gpa REAL NOT NULL,
+	grade TEXT NOT NULL,
+	PRIMARY KEY (term, roll_no)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS students_roll_no ON students (roll_no, term);
+CREATE TABLE IF NOT EXISTS marks (
+	term TEXT NOT NULL REFERENCES terms(term) ON DELETE CASCADE,
+	roll_no NOT NULL,
+	subject TEXT NOT NULL,
+	mark REAL NOT NULL,
+	PRIMARY KEY (term, roll_no, subject)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS term_summary (
+	term TEXT NOT NULL REFERENCES terms(term) ON DELETE CASCADE,
+	column_name TEXT NOT NULL,
+	count INTEGER NOT NULL,
+	mean REAL,
+	min REAL,
+	max REAL,
+	PRIMARY KEY (term, column_name)
+) WITHOUT ROWID;
+"""
+
+
+# Local multi-term store of scored results (output of StudentReport.to_dataframe)
+# Each term is written once; trends are then answered from indexed SQLite tables
+# instead of re-reading and re-scoring the old files. Terms are ordered by the
+# position they were added at unless an explicit position is given.
+# Usage:
+#   with TermStore("terms.db") as store:
+#       store.add_term("2025-T1", scored)
+#       store.trajectory(1042)
+class TermStore:
+	# Open (or create) the store; path ":memory:" keeps it in memory
+	def __init__(self, path=":memory:"):
+		self.path = path
+		self._conn = sqlite3.connect(path)
+		self._conn.execute("PRAGMA foreign_keys = ON")
+		if path != ":memory:":
+			self._conn.execute("PRAGMA journal_mode = WAL")  # Readers do not block the writer
+		self._conn.executescript(_SCHEMA_SQL)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc):
+		self.close()
+		return False
+
+	# Close the database connection
+	def close(self):
+		self._conn.close()
+
+	# Store one term's scored students in a single transaction
+	# schema: SubjectSchema whose subject columns are stored (default: math, science, english)
+	# replace: overwrite a term that is already stored instead of raising ValueError
+	# position: where the term sorts chronologically (default: after every stored term)
+	def add_term(self, term, scored, schema=None, replace=False, position=None):
+		subjects = [s for s in (schema or DEFAULT_SCHEMA).subject_names if s in scored.columns]
+		missing = [c for c in ("roll_no", "GPA", "Grade") if c not in scored.columns]
+		if missing:
+			raise ValueError(f"Scored data is missing columns: {', '.join(missing)}")
+
+		roll_no = scored["roll_no"].tolist()
+		names = scored["name"].astype(str).tolist() if "name" in scored else [None] * len(scored)
+		with self._conn:
+			existing = self._conn.execute("SELECT position FROM terms WHERE term = ?", (term,)).fetchone()
+			if existing is not None:
+				if not replace:
+					raise ValueError(f"Term {term!r} is already stored")
+				self._conn.execute("DELETE FROM terms WHERE term = ?", (term,))
+				position = existing[0] if position is None else position
+			if position is None:
+				position = self._conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM terms").fetchone()[0]
+			self._conn.execute("INSERT INTO terms VALUES (?, ?, ?)", (term, position, time.time()))
+			self._conn.executemany(
+				"INSERT INTO students VALUES (?, ?, ?, ?, ?)",
+				zip([term] * len(scored), roll_no, names, scored["GPA"].tolist(), scored["Grade"].tolist()))
+			for subject in subjects:
+				self._conn.executemany(
+					"INSERT INTO marks VALUES (?, ?, ?, ?)",
+					zip([term] * len(scored), roll_no, [subject] * len(scored), scored[subject].tolist()))
+			aggregates = scored[["GPA"] + subjects].agg(["count", "mean", "min", "max"]).T
+			self._conn.executemany(
+				"INSERT INTO term_summary VALUES (?, ?, ?, ?, ?, ?)",
+				[(term, column, int(row["count"]), *(None if pd.isna(v) else float(v)
+														for v in (row["mean"], row["min"], row["max"])))
+				 for column, row in aggregates.iterrows()])
+
+	# Delete a stored term and all of its rows
+	def remove_term(self, term):
+		with self._conn:
+			self._conn.execute("DELETE FROM terms WHERE term = ?", (term,))
+
+	# Stored terms in chronological order
+	def terms(self):
+		return [row[0] for row in self._conn.execute("SELECT term FROM terms ORDER BY position, term")]
+
+	# Run a query and return the rows as a DataFrame
+	def _frame(self, sql, params=()):
+		cursor = self._conn.execute(sql, params)
+		return pd.DataFrame(cursor.fetchall(), columns=[d[0] for d in cursor.description])
+
+	# GPA and grade of one student in every term they appear in, oldest first
+	def trajectory(self, roll_no):
+		return self._frame(
+			"SELECT s.term, s.name, s.gpa AS GPA, s.grade AS Grade FROM students s "
+			"JOIN terms t ON t.term = s.term WHERE s.roll_no = ? ORDER BY t.position, t.term",
+			(roll_no,))
+
+	# Per term, oldest first: number of students, mean / min / max GPA and the mean of
+	# every subject (read from term_summary, so the cost depends on the number of terms)
+	def cohort_means(self):
+		summary = self._frame(
+			"SELECT s.term, s.column_name, s.count, s.mean, s.min, s.max FROM term_summary s "
+			"JOIN terms t ON t.term = s.term ORDER BY t.position, t.term")
+		terms = list(dict.fromkeys(summary["term"]))
+		gpa = summary[summary["column_name"] == "GPA"].set_index("term")
+		means = pd.DataFrame({"term": terms})
+		means["students"] = gpa["count"].reindex(terms).to_numpy()
+		for stat in ("mean", "min", "max"):
+			means[f"{stat}_GPA"] = gpa[stat].reindex(terms).to_numpy()
+		subjects = summary[summary["column_name"] != "GPA"]
+		if len(subjects):
+			wide = subjects.pivot(index="term", columns="column_name", values="mean")
+			wide.columns.name = None
+			means = means.join(wide.add_prefix("mean_"), on="term")
+		return means
+
+	# Students whose GPA fell the most between two terms (default: the last two stored)
+	# Only students present in both terms are compared; returns at most n rows
+	def largest_decliners(self, from_term=None, to_term=None, n=10):
+		if from_term is None or to_term is None:
+			terms = self.terms()
+			if len(terms) < 2:
+				raise ValueError("At least two terms are needed to compare GPAs")
+			from_term = terms[-2] if from_term is None else from_term
+			to_term = terms[-1] if to_term is None else to_term
+		return self._frame(
+			"SELECT b.roll_no, b.name, a.gpa AS from_GPA, b.gpa AS to_GPA, ROUND(b.gpa - a.gpa, 2) AS change, "
+			"a.grade AS from_Grade, b.grade AS to_Grade "
+			"FROM students a JOIN students b ON b.roll_no = a.roll_no "
+			"WHERE a.term = ? AND b.term = ? AND b.gpa < a.gpa "
+			"ORDER BY change, b.roll_no LIMIT ?",
+			(from_term, to_term, int(n)))
+
+	# Long frame of term, roll_no and GPA for the given terms (default: all), in term
+	# order; "term" is an ordered categorical so charts keep the chronological order
+	def gpa_history(self, terms=None):
+		ordered = self.terms()
+		terms = ordered if terms is None else [t for t in ordered if t in set(terms)]
+		if not terms:
+			return pd.DataFrame({"term": pd.Categorical([], categories=[], ordered=True),
+								 "roll_no": [], "GPA": []})
+		marks = ", ".join("?" * len(terms))
+		df = self._frame(f"SELECT term, roll_no, gpa AS GPA FROM students WHERE term IN ({marks})", terms)
+		df["term"] = pd.Categorical(df["term"], categories=terms, ordered=True)
+		return df.sort_values(["term", "roll_no"], kind="stable").reset_index(drop=True)
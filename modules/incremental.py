@@ -0,0 +1,150 @@
+# Import required libraries for incremental (append-only) scoring
+import numpy as np   # For the growable column arrays holding scored students
+import pandas as pd  # For batch inputs and the assembled result frame
+from .report import score_dataframe  # Vectorized GPA and grade scoring
+from .schema import DEFAULT_SCHEMA  # Subjects and grades being tracked
+from .stats import DeltaSummary  # Aggregates that support insert/update/delete
+
+
+# Class keeping a scored result set that is updated in place with small batches
+# Students are keyed on roll_no. Scored rows live in growable column arrays with a
+# roll_no -> position dict and a tombstone mask for deletions, so inserts, updates
+# and deletes cost O(batch) and only the affected students are rescored. The
+# summary statistics, grade histogram and correlation matrix are updated by deltas.
+class IncrementalReport:
+	# Initialize the report, optionally scoring an initial DataFrame of raw marks
+	# schema: optional SubjectSchema (default: math, science, english)
+	def __init__(self, df=None, capacity=1024, schema=None):
+		self.schema = schema or DEFAULT_SCHEMA
+		self.subjects = self.schema.subject_names
+		self.summary = DeltaSummary(self.subjects + ["GPA"], self.schema.grades)
+		self._positions = {}                                          # roll_no -> row position
+		self._roll_no = np.empty(capacity, dtype=object)
+		self._name = np.empty(capacity, dtype=object)
+		self._marks = np.empty((capacity, len(self.subjects)), dtype=float)
+		self._gpa = np.empty(capacity, dtype=float)
+		self._grade = np.empty(capacity, dtype=object)
+		self._alive = np.zeros(capacity, dtype=bool)                  # False for free or deleted rows
+		self._size = 0                                                # Rows used, including deleted ones
+		if df is not None:
+			self.apply(inserts=df)
+
+	# Number of students currently in the report
+	def __len__(self):
+		return len(self._positions)
+
+	# Apply one batch of changes: deletes first, then updates, then inserts
+	# inserts / updates: DataFrames of raw marks (roll_no, name, math, science, english)
+	# deletes: iterable of roll numbers
+	# The whole batch is validated and scored before anything changes, so an invalid
+	# batch raises ValueError and leaves the report untouched
+	def apply(self, inserts=None, updates=None, deletes=None):
+		deletes = list(deletes) if deletes is not None else []
+		new_rows = score_dataframe(inserts, self.schema) if inserts is not None else None
+		changed_rows = score_dataframe(updates, self.schema) if updates is not None else None
+
+		# Check the keys of every part of the batch against the current students
+		if len(set(deletes)) != len(deletes):
+			raise ValueError("Duplicate roll_no in deletes")
+		missing = [roll for roll in deletes if roll not in self._positions]
+		if missing:
+			raise ValueError(f"Cannot delete unknown roll_no: {missing[:10]}")
+		deleted = set(deletes)
+		if changed_rows is not None:
+			self._check_keys(changed_rows, "updates")
+			missing = [roll for roll in changed_rows["roll_no"] if roll not in self._positions or roll in deleted]
+			if missing:
+				raise ValueError(f"Cannot update unknown roll_no: {missing[:10]}")
+		if new_rows is not None:
+			self._check_keys(new_rows, "inserts")
+			existing = [roll for roll in new_rows["roll_no"] if roll in self._positions and roll not in deleted]
+			if existing:
+				raise ValueError(f"Cannot insert existing roll_no: {existing[:10]}")
+
+		# Deletes: drop the old rows from the aggregates and mark them as dead
+		if deletes:
+			positions = np.array([self._positions.pop(roll) for roll in deletes])
+			self.summary.remove(self._frame(positions))
+			self._alive[positions] = False
+
+		# Updates: swap the old rows' contribution for the rescored rows in place
+		if changed_rows is not None and len(changed_rows):
+			positions = np.array([self._positions[roll] for roll in changed_rows["roll_no"]])
+			self.summary.remove(self._frame(positions))
+			self._write(positions, changed_rows)
+			self.summary.add(changed_rows)
+
+		# Inserts: append the new rows, growing the arrays when needed
+		if new_rows is not None and len(new_rows):
+			positions = self._allocate(len(new_rows))
+			self._write(positions, new_rows)
+			self._positions.update(zip(new_rows["roll_no"], positions.tolist()))
+			self.summary.add(new_rows)
+
+		# Reclaim space once more than half of the used rows are deleted
+		if self._size > 1024 and len(self._positions) < self._size // 2:
+			self._compact()
+
+	# Return the scored row for one student as a dict
+	def get(self, roll_no):
+		row = self._frame(np.array([self._positions[roll_no]])).iloc[0]
+		return row.to_dict()
+
+	# Return all current students as a DataFrame like StudentReport.to_dataframe
+	def to_dataframe(self):
+		return self._frame(np.flatnonzero(self._alive[:self._size]))
+
+	# Correlation matrix of the subjects and GPA, as used by charts.save_heatmap
+	def correlation(self):
+		return self.summary.correlation()
+
+	# Reject a batch that repeats a roll number
+	def _check_keys(self, scored, label):
+		if scored["roll_no"].duplicated().any():
+			raise ValueError(f"Duplicate roll_no in {label}")
+
+	# Build a scored DataFrame from the rows at the given positions
+	def _frame(self, positions):
+		frame = pd.DataFrame({"roll_no": self._roll_no[positions], "name": self._name[positions]})
+		for i, subject in enumerate(self.subjects):
+			frame[subject] = self._marks[positions, i]
+		frame["GPA"] = self._gpa[positions]
+		frame["Grade"] = self._grade[positions]
+		frame["roll_no"] = frame["roll_no"].infer_objects()
+		return frame
+
+	# Copy scored rows into the arrays at the given positions
+	def _write(self, positions, scored):
+		self._roll_no[positions] = scored["roll_no"].to_numpy()
+		self._name[positions] = scored["name"].to_numpy()
+		self._marks[positions] = scored[self.subjects].to_numpy(dtype=float)
+		self._gpa[positions] = scored["GPA"].to_numpy()
+		self._grade[positions] = scored["Grade"].to_numpy()
+		self._alive[positions] = True
+
+	# Reserve n new row positions at the end, doubling the arrays when full
+	def _allocate(self, n):
+		needed = self._size + n
+		if needed > len(self._alive):
+			self._resize(max(needed, 2 * len(self._alive)))
+		positions = np.arange(self._size, needed)
+		self._size = needed
+		return positions
+
+	# Reallocate every column array to the given capacity
+	def _resize(self, capacity):
+		for attr in ("_roll_no", "_name", "_marks", "_gpa", "_grade", "_alive"):
+			old = getattr(self, attr)
+			new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+			new[:self._size] = old[:self._size]
+			setattr(self, attr, new)
+
+	# Move the live rows to the front and rebuild the position index
+	def _compact(self):
+		live = np.flatnonzero(self._alive[:self._size])
+		for attr in ("_roll_no", "_name", "_marks", "_gpa", "_grade", "_alive"):
+			array = getattr(self, attr)
+			array[:len(live)] = array[live]
+		self._alive[len(live):self._size] = False
+		self._size = len(live)
+		self._positions = dict(zip(self._roll_no[:self._size], range(self._size)))
@@ -0,0 +1,135 @@
+# Import required libraries for per-stage pipeline instrumentation
+import json         # For structured log records
+import logging      # For emitting stage timings as log lines
+import os           # For atomic metrics file writes
+import sys          # For the ru_maxrss unit on macOS
+import time         # For wall-clock timing
+import tracemalloc  # For per-stage Python allocation peaks
+from contextlib import contextmanager  # For the stage context manager
+
+try:
+	import resource  # For the process peak resident set size (not available on Windows)
+except ImportError:
+	resource = None
+
+
+# Logger used by PipelineTimer.log
+logger = logging.getLogger("student_report.pipeline")
+
+
+# Shared record handed out by a disabled timer; writes to it are simply discarded
+class _NullRecord(dict):
+	def __setitem__(self, key, value):
+		pass
+
+
+# Context manager returned by a disabled timer: no timing, no allocation
+class _NullStage:
+	record = _NullRecord()
+
+	def __enter__(self):
+		return self.record
+
+	def __exit__(self, *exc):
+		return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+# Peak resident set size of this process in bytes (ru_maxrss is KB on Linux, bytes on macOS)
+# None where the resource module is not available
+def _peak_rss_bytes():
+	if resource is None:
+		return None
+	peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	return peak if sys.platform == "darwin" else peak * 1024
+
+
+# Class recording wall time, rows, bytes in/out and memory for each pipeline stage
+# Usage:
+#   timer = PipelineTimer()
+#   with timer.stage("scoring", rows=len(df)) as record:
+#       ...
+#       record["bytes_out"] = ...
+# When enabled=False, stage() returns a shared no-op context manager, so leaving
+# the instrumentation in place costs next to nothing. Every stage records
+# process_peak_rss_bytes, the high-water mark of the whole process so far (it never
+# goes down, so it is not the stage's own usage). With trace_memory=True the stage
+# also records peak_memory_bytes, the tracemalloc peak of Python allocations made
+# during the stage (slower).
+class PipelineTimer:
+	# Initialize an empty timer
+	def __init__(self, enabled=True, trace_memory=False):
+		self.enabled = enabled
+		self.trace_memory = trace_memory
+		self.records = []  # One dict per finished stage, in order
+
+	# Time one stage; the yielded dict can be updated with rows / bytes_in / bytes_out
+	def stage(self, name, rows=None, bytes_in=None, bytes_out=None):
+		if not self.enabled:
+			return _NULL_STAGE
+		return self._stage(name, rows, bytes_in, bytes_out)
+
+	@contextmanager
+	def _stage(self, name, rows, bytes_in, bytes_out):
+		record = {"stage": name, "rows": rows, "bytes_in": bytes_in, "bytes_out": bytes_out}
+		tracing = self.trace_memory and not tracemalloc.is_tracing()
+		if tracing:
+			tracemalloc.start()
+		start = time.perf_counter()
+		try:
+			yield record
+		finally:
+			record["wall_s"] = time.perf_counter() - start
+			if tracing:
+				record["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+				tracemalloc.stop()
+			else:
+				record["peak_memory_bytes"] = None
+			record["process_peak_rss_bytes"] = _peak_rss_bytes()
+			self.records.append(record)
+
+	# Total wall time of all recorded stages
+	def total_seconds(self):
+		return sum(record["wall_s"] for record in self.records)
+
+	# Records as a DataFrame for display
+	def to_frame(self):
+		import pandas as pd
+		columns = ["stage", "wall_s", "rows", "bytes_in", "bytes_out", "peak_memory_bytes",
+				   "process_peak_rss_bytes"]
+		return pd.DataFrame(self.records, columns=columns)
+
+	# Emit one structured (JSON) log line per stage
+	def log(self, level=logging.INFO):
+		for record in self.records:
+			logger.log(level, json.dumps({"event": "pipeline_stage", **record}))
+
+	# Render the records in the OpenMetrics text format (readable by Prometheus)
+	def to_openmetrics(self, prefix="student_pipeline"):
+		metrics = [
+			("stage_seconds", "wall_s", "Wall time of the stage in seconds"),
+			("stage_rows", "rows", "Rows processed by the stage"),
+			("stage_bytes_in", "bytes_in", "Bytes read by the stage"),
+			("stage_bytes_out", "bytes_out", "Bytes produced by the stage"),
+			("stage_peak_memory_bytes", "peak_memory_bytes", "Peak Python allocations during the stage in bytes"),
+			("process_peak_rss_bytes", "process_peak_rss_bytes", "Process peak RSS after the stage in bytes"),
+		]
+		lines = []
+		for metric, key, help_text in metrics:
+			samples = [(record["stage"], record[key]) for record in self.records if record.get(key) is not None]
+			if not samples:
+				continue
+			lines.append(f"# TYPE {prefix}_{metric} gauge")
+			lines.append(f"# HELP {prefix}_{metric} {help_text}")
+			for stage, value in samples:
+				lines.append(f'{prefix}_{metric}{{stage="{stage}"}} {value}')
+		lines.append("# EOF")
+		return "\n".join(lines) + "\n"
+
+	# Write the OpenMetrics text atomically, e.g. for a textfile collector to scrape
+	def write_openmetrics(self, path, prefix="student_pipeline"):
+		with open(path + ".tmp", "w", encoding="utf-8") as f:
+			f.write(self.to_openmetrics(prefix))
+		os.replace(path + ".tmp", path)
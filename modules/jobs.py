@@ -0,0 +1,188 @@
+# Import required libraries for running uploads through the pipeline in the background
+import itertools  # For job ids
+import threading  # For guarding the shared job table
+import time       # For submit / start / finish timestamps
+from collections import OrderedDict  # For keeping finished jobs in completion order
+from concurrent.futures import ThreadPoolExecutor  # For the job worker threads
+from io import BytesIO  # For handing uploaded bytes to the pipeline
+
+from .cache import hash_bytes  # For deduplicating identical uploads
+from .charts import chart_process_pool  # For the shared chart worker processes
+from .instrumentation import PipelineTimer  # For per-stage progress
+from .pipeline import run_pipeline  # For the actual report build
+from .query import StudentIndex  # For indexing results before they are delivered
+
+
+# Job states, in the order a job moves through them
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+# Raised when the queue, or one user's share of it, is full
+class QueueFullError(RuntimeError):
+	pass
+
+
+# Dedupe / cache key of an upload: its bytes plus everything that changes the result
+def job_key(data, schema_bytes=b"", quarantine=False):
+	key = hash_bytes(data) + ("-" + hash_bytes(schema_bytes) if schema_bytes else "")
+	return key + ("-quarantine" if quarantine else "")
+
+
+# Timer that also publishes the stage currently running on its job
+class _ProgressTimer(PipelineTimer):
+	def __init__(self, job, trace_memory=False):
+		super().__init__(enabled=True, trace_memory=trace_memory)
+		self.job = job
+
+	def stage(self, name, rows=None, bytes_in=None, bytes_out=None):
+		self.job.stage = name
+		return super().stage(name, rows, bytes_in, bytes_out)
+
+
+# One upload moving through the queue
+# Shared by every user who submitted the same bytes with the same schema; read it,
+# do not modify it outside JobQueue
+class Job:
+	def __init__(self, job_id, key, name, data, schema, owner, quarantine=False, trace_memory=False):
+		self.id = job_id
+		self.key = key
+		self.name = name
+		self.data = data  # Dropped once the job has finished
+		self.schema = schema
+		self.quarantine = quarantine
+		self.owners = {owner}
+		self.status = QUEUED
+		self.stage = None  # Pipeline stage currently running
+		self.error = None  # Error message when the job failed
+		self.report = None  # ValidationReport when the job failed on invalid values
+		self.result = None  # run_pipeline result (plus "index") when the job is done
+		self.timer = _ProgressTimer(self, trace_memory)
+		self.submitted = time.time()
+		self.started = None
+		self.finished = None
+
+	@property
+	def active(self):
+		return self.status in (QUEUED, RUNNING)
+
+
+# Shared, bounded queue of pipeline jobs with a thread pool behind it
+# - Identical uploads (same bytes and schema) are deduplicated: a second submit joins
+#   the job already queued, running or finished instead of building the report twice
+# - At most max_pending jobs may be waiting or running in total and at most
+#   per_user_limit per owner; submit raises QueueFullError beyond that
+# - Up to max_workers jobs run at once. Charts are drawn on Figure objects (no pyplot
+#   state), in a process pool shared by every job, so concurrent jobs cannot interfere
+#   with each other's figures and chart CPU stays bounded however many jobs run
+# - Finished results go into the optional ResultCache; the last keep_finished
+#   finished jobs are kept so their owners can collect them
+class JobQueue:
+	# Initialize the queue and its worker pools (chart processes start on first use)
+	def __init__(self, max_workers=2, max_pending=64, per_user_limit=2, keep_finished=100,
+				 cache=None, chart_workers=None):
+		self.max_pending = max_pending
+		self.per_user_limit = per_user_limit
+		self.keep_finished = keep_finished
+		self.cache = cache
+		self._ids = itertools.count(1)
+		self._jobs = {}  # job id -> Job, for every job still tracked
+		self._by_key = {}  # dedupe key -> job id
+		self._finished = OrderedDict()  # job id -> None, oldest finished first
+		self._lock = threading.Lock()
+		self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report-job")
+		self._chart_executor = chart_process_pool(chart_workers)
+
+	# Queue an upload and return its Job (an existing one for duplicate uploads)
+	# owner: id of the user / session submitting, used for the per-user limit
+	# data: the uploaded file's bytes; name: its file name (used to detect the format)
+	# schema: optional SubjectSchema; schema_bytes: the raw schema file, for the dedupe key
+	# quarantine: score the valid rows and set invalid ones aside instead of failing
+	# trace_memory: record each stage's peak Python allocations (tracemalloc, slower;
+	# tracing is process-wide, so a stage running next to another job's counts both)
+	def submit(self, owner, data, name, schema=None, schema_bytes=b"", quarantine=False,
+			   trace_memory=False):
+		key = job_key(data, schema_bytes, quarantine)
+		with self._lock:
+			# Join an identical job that is still tracked
+			job = self._jobs.get(self._by_key.get(key))
+			if job is not None and job.status != FAILED:
+				job.owners.add(owner)
+				return job
+
+			# A result cached earlier (possibly by another process) completes immediately
+			job = Job(next(self._ids), key, name, data, schema, owner, quarantine, trace_memory)
+			cached = self.cache.get(key) if self.cache is not None else None
+			if cached is not None:
+				job.status, job.result, job.data = DONE, cached, None
+				job.started = job.finished = job.submitted
+				self._track(job)
+				self._retire(job)
+				return job
+
+			active = [j for j in self._jobs.values() if j.active]
+			if len(active) >= self.max_pending:
+				raise QueueFullError("The report queue is full, please try again in a moment")
+			if sum(owner in j.owners for j in active) >= self.per_user_limit:
+				raise QueueFullError(f"You already have {self.per_user_limit} reports in progress")
+			self._track(job)
+		self._executor.submit(self._run, job)
+		return job
+
+	# Look up a job by id (None once it has been dropped)
+	def get(self, job_id):
+		return self._jobs.get(job_id)
+
+	# Number of queued jobs ahead of this one (0 when it is running or finished)
+	def position(self, job):
+		if job.status != QUEUED:
+			return 0
+		with self._lock:
+			return sum(j.status == QUEUED and j.id < job.id for j in self._jobs.values())
+
+	# Counts of jobs per state
+	def stats(self):
+		with self._lock:
+			counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+			for job in self._jobs.values():
+				counts[job.status] += 1
+			return counts
+
+	# Stop accepting work and wait for running jobs
+	def shutdown(self, wait=True):
+		self._executor.shutdown(wait=wait)
+		self._chart_executor.shutdown(wait=wait)
+
+	# Register a job under its id and dedupe key (lock held)
+	def _track(self, job):
+		self._jobs[job.id] = job
+		self._by_key[job.key] = job.id
+
+	# Mark a job finished and drop the oldest finished jobs beyond keep_finished (lock held)
+	def _retire(self, job):
+		self._finished[job.id] = None
+		while len(self._finished) > self.keep_finished:
+			old_id, _ = self._finished.popitem(last=False)
+			old = self._jobs.pop(old_id)
+			if self._by_key.get(old.key) == old_id:
+				del self._by_key[old.key]
+
+	# Worker: run the pipeline for one job and index its result
+	def _run(self, job):
+		job.status, job.started = RUNNING, time.time()
+		try:
+			source = BytesIO(job.data)
+			source.name = job.name
+			result = run_pipeline(source, timer=job.timer, schema=job.schema,
+								  chart_executor=self._chart_executor, quarantine=job.quarantine)
+			with job.timer.stage("index", rows=len(result["df"])):
+				result["index"] = StudentIndex(result["df"])
+			if self.cache is not None:
+				self.cache.put(job.key, result)
+			job.result, job.status = result, DONE
+		except Exception as e:
+			# ValueError covers bad files and marks; anything else is still reported
+			job.error, job.report, job.status = str(e), getattr(e, "report", None), FAILED
+		finally:
+			job.stage, job.data, job.finished = None, None, time.time()
+			with self._lock:
+				self._retire(job)
@@ -1,9 +1,28 @@
 from io import BytesIO
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib.pagesizes import A4
 
 
+# Student tables longer than this are written in fixed-size page chunks
+LARGE_REPORT_THRESHOLD = 1000
+
+# Rows per chunk in large-report mode; with the compact style below one chunk fills an A4 page
+ROWS_PER_PAGE = 40
+
+# Summaries with more columns than this (e.g. schemas with many subjects) are laid
+# out with one row per column instead, so they still fit the page width
+MAX_SUMMARY_COLUMNS = 6
+
+# Compact style used for the chunked student tables
+CHUNK_TABLE_STYLE = TableStyle([
+    ("FONTSIZE", (0, 0), (-1, -1), 8),
+    ("TOPPADDING", (0, 0), (-1, -1), 2),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
+    ("LINEBELOW", (0, 0), (-1, 0), 0.5, (0, 0, 0)),
+])
+
+
 class PDFReportGenerator:
     def __init__(self, df, summary, chart_files):
         """
@@ -12,13 +31,69 @@ class PDFReportGenerator:
         Args:
             df (DataFrame): Detailed student data (roll no, name, GPA, grade, etc.)
             summary (DataFrame): Summary statistics of student performance.
-            chart_files (list): List of file paths to saved chart images.
+            chart_files (list or dict): Chart images as file paths, file-like
+                objects or PNG bytes, e.g. the dict returned by
+                charts.render_all_charts; bytes are read straight from memory.
         """
         self.df = df
         self.summary = summary
         self.chart_files = chart_files
 
-    def generate(self):
+    def summary_rows(self):
+        """
+        Build the summary table rows, following the number of subject columns.
+
+        Returns:
+            list: Header row followed by value rows. Summaries wider than
+            MAX_SUMMARY_COLUMNS are transposed to one row per column, with the
+            statistic names as the header.
+        """
+        if len(self.summary.columns) <= MAX_SUMMARY_COLUMNS:
+            return [self.summary.columns.to_list()] + self.summary.values.tolist()
+        transposed = self.summary.T.round(2)
+        return ([[""] + transposed.columns.to_list()] +
+                [[column] + values for column, values in zip(transposed.index, transposed.values.tolist())])
+
+    def chart_images(self):
+        """
+        Return the charts in a form ReportLab's Image can read, without touching disk.
+
+        Returns:
+            list: File paths and file-like objects; PNG bytes are wrapped in BytesIO.
+        """
+        charts = self.chart_files.values() if isinstance(self.chart_files, dict) else self.chart_files
+        return [BytesIO(chart) if isinstance(chart, (bytes, bytearray)) else chart for chart in charts]
+
+    def student_rows(self):
+        """
+        Build the student table rows straight from the column arrays.
+
+        Returns:
+            list: One [roll_no, name, GPA, grade] list per student.
+        """
+        return [list(row) for row in zip(self.df["roll_no"].tolist(), self.df["name"].tolist(),
+                                         self.df["GPA"].tolist(), self.df["Grade"].tolist())]
+
+    def student_tables(self, rows_per_page=ROWS_PER_PAGE):
+        """
+        Split the student table into fixed-size chunks, each with its own header row.
+
+        Each chunk fits on one page, so ReportLab never has to lay out and split
+        one huge table.
+
+        Args:
+            rows_per_page (int): Number of students per chunk.
+
+        Yields:
+            Table: One student table per page.
+        """
+        header = ["Roll No", "Name", "GPA", "Grade"]
+        rows = self.student_rows()
+        for start in range(0, len(rows), rows_per_page):
+            yield Table([header] + rows[start:start + rows_per_page], hAlign="LEFT",
+                        repeatRows=1, style=CHUNK_TABLE_STYLE)
+
+    def generate(self, sink=None, rows_per_page=None):
         """
         Generate a PDF report containing:
         - Title
@@ -26,11 +101,24 @@ class PDFReportGenerator:
         - Visualizations (charts)
         - Student-level detailed report
 
+        Reports with more than LARGE_REPORT_THRESHOLD students (or any report when
+        rows_per_page is given) write the student section in page-sized chunks
+        with repeated headers, starting on a new page.
+
+        Args:
+            sink (str or file-like, optional): File path or writable binary file
+                to write the PDF to. Defaults to a new in-memory buffer.
+            rows_per_page (int, optional): Students per page in large-report mode.
+
         Returns:
-            BytesIO: A buffer containing the generated PDF.
+            BytesIO: A buffer containing the generated PDF, or sink when given.
         """
-        # Create a memory buffer to store PDF output
-        buffer = BytesIO()
+        # Create a memory buffer to store PDF output unless a sink was given
+        buffer = BytesIO() if sink is None else sink
+
+        # Switch to chunked student tables for large classes
+        if rows_per_page is None and len(self.df) > LARGE_REPORT_THRESHOLD:
+            rows_per_page = ROWS_PER_PAGE
 
         # Set up the PDF document with A4 page size
         doc = SimpleDocTemplate(buffer, pagesize=A4)
@@ -49,37 +137,40 @@ class PDFReportGenerator:
         elements.append(Paragraph("Summary Statistics", styles['Heading2']))
 
         # Convert summary DataFrame to a ReportLab table
-        summary_table = Table([self.summary.columns.to_list()] + self.summary.values.tolist())
+        summary_table = Table(self.summary_rows())
         elements.append(summary_table)
         elements.append(Spacer(1, 12))
 
         # --- Visualizations ---
         elements.append(Paragraph("Visualizations", styles['Heading2']))
 
-        # Loop through provided chart image files and insert into PDF
-        for chart_file in self.chart_files:
+        # Loop through provided chart images and insert into PDF
+        for chart_file in self.chart_images():
             elements.append(Image(chart_file, width=400, height=250))
             elements.append(Spacer(1, 12))
 
         # --- Student-Level Report ---
-        elements.append(Paragraph("Student-Level Report", styles['Heading2']))
-
-        # Create table headers
-        student_table_data = [["Roll No", "Name", "GPA", "Grade"]]
+        if rows_per_page:
+            # Large report: one page-sized table per chunk of students
+            elements.append(PageBreak())
+            elements.append(Paragraph("Student-Level Report", styles['Heading2']))
+            elements.extend(self.student_tables(rows_per_page))
+        else:
+            elements.append(Paragraph("Student-Level Report", styles['Heading2']))
 
-        # Loop through dataframe rows and add student details
-        for _, row in self.df.iterrows():  # pyright: ignore[reportUndefinedVariable]
-            student_table_data.append([row["roll_no"], row["name"], row["GPA"], row["Grade"]])
+            # Create table headers followed by one row per student
+            student_table_data = [["Roll No", "Name", "GPA", "Grade"]] + self.student_rows()
 
-        # Create student detail table and align to left
-        student_table = Table(student_table_data, hAlign="LEFT")
-        elements.append(student_table)
+            # Create student detail table and align to left
+            student_table = Table(student_table_data, hAlign="LEFT")
+            elements.append(student_table)
 
         # Build the PDF with all elements
         doc.build(elements)
 
-        # Reset buffer position to start
-        buffer.seek(0)
+        # Reset buffer position to start (file paths have nothing to rewind)
+        if hasattr(buffer, "seek"):
+            buffer.seek(0)
 
         # Return PDF buffer
         return buffer
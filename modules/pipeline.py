@@ -0,0 +1,78 @@
+# Import required libraries for the end-to-end report pipeline
+# Charting (matplotlib, seaborn) and PDF (reportlab) modules are imported only when
+# their stage runs, so headless callers that skip them never pay their import cost
+import os  # For the size of uploads given as paths
+
+from .stats import HistogramSummary  # For the summary table, percentiles and grade what-ifs
+from .instrumentation import PipelineTimer  # For per-stage timings
+from utils.file_utils import read_and_validate_csv, validate_and_score  # For reading, validating and scoring
+
+
+# Size in bytes of an upload given as a path, a Streamlit upload or a file-like object
+def _source_size(source):
+	if isinstance(source, (str, os.PathLike)):
+		return os.path.getsize(source)
+	if hasattr(source, "size"):
+		return source.size
+	if hasattr(source, "getbuffer"):
+		return source.getbuffer().nbytes
+	return None
+
+
+# Run CSV -> scoring -> summary -> charts -> PDF for one upload
+# source: path or file-like object with the CSV data
+# render_charts / build_pdf: skip the chart and PDF stages when False
+# chart_options / max_workers: passed on to charts.render_all_charts
+# chart_executor: optional process pool shared between runs for the chart renders
+# (charts are rendered serially in this process without one or max_workers > 1)
+# timer: optional PipelineTimer recording every stage (a disabled one is used otherwise)
+# schema: optional SubjectSchema with the subjects, weights and grade cut-offs
+# quarantine: set rows with invalid cells aside and report on the rest instead of failing
+# max_errors: problems listed in the validation report (all of them are counted)
+# Raises utils.file_utils.CSVValidationError for bad files, and DataValidationError
+# (with every invalid cell in .report) for bad values unless quarantine is set
+# Returns a dict with the scored DataFrame ("df"), the summary table ("summary"), the
+# HistogramSummary behind it ("stats", for percentile ranks and grade what-ifs),
+# the chart images as a dict of name -> PNG bytes ("charts"), the PDF bytes ("pdf", None
+# if skipped), the ValidationReport ("validation") and the quarantined raw rows ("quarantined")
+def run_pipeline(source, render_charts=True, build_pdf=True, chart_options=None, max_workers=None,
+				 timer=None, schema=None, chart_executor=None, quarantine=False, max_errors=1000):
+	timer = timer or PipelineTimer(enabled=False)
+
+	# Step 1: Read and validate the CSV file
+	with timer.stage("read_and_validate", bytes_in=_source_size(source)) as record:
+		df = read_and_validate_csv(source, schema=schema, check_values=False)
+		record["rows"] = len(df)
+
+	# Step 2: Check every cell (empty, not a number, out of range, duplicate roll_no),
+	# then calculate GPAs and assign grades in the same vectorized pass
+	with timer.stage("scoring", rows=len(df)):
+		df, quarantined, report = validate_and_score(df, schema, quarantine, max_errors)
+
+	# Step 3: Calculate statistical summary (mean, std, min, quartiles, max) from
+	# fixed-bin histograms instead of sorting every column
+	with timer.stage("summary", rows=len(df)):
+		stats = HistogramSummary.for_schema(schema)
+		stats.update(df)
+		summary = stats.to_frame()
+
+	# Step 4: Render the charts into in-memory PNG bytes
+	chart_images = {}
+	if render_charts:
+		with timer.stage("charts", rows=len(df)) as record:
+			from . import charts
+			chart_images = charts.render_all_charts(df, options=chart_options, max_workers=max_workers,
+													executor=chart_executor, schema=schema)
+			record["bytes_out"] = sum(len(png) for png in chart_images.values())
+
+	# Step 5: Build the PDF report from the same in-memory PNGs (no temp files, no re-render)
+	pdf_bytes = None
+	if build_pdf:
+		with timer.stage("pdf", rows=len(df)) as record:
+			from .pdfgenerator import PDFReportGenerator
+			pdf_gen = PDFReportGenerator(df, summary, chart_images)
+			pdf_bytes = pdf_gen.generate().getvalue()
+			record["bytes_out"] = len(pdf_bytes)
+
+	return {"df": df, "summary": summary, "stats": stats, "charts": chart_images, "pdf": pdf_bytes,
+			"validation": report, "quarantined": quarantined}
@@ -0,0 +1,142 @@
+# Import required libraries for searching and paging large scored result sets
+import numpy as np   # For sorted indexes and position arrays
+import pandas as pd  # For the hash index on roll_no and returning pages
+
+
+# Upper bound appended to a name prefix so every name starting with it sorts below
+_PREFIX_END = "\U0010ffff"
+
+
+# Indexed, read-only query layer over the output of StudentReport.to_dataframe
+# Indexes are built once up front so the dashboard can search, filter and page
+# through hundreds of thousands of students without scanning the frame:
+#   roll_no -> hash index (pandas Index), exact lookups in O(1)
+#   name    -> sorted lower-case names, prefix search by binary search
+#   GPA     -> positions sorted by GPA, range filters by binary search
+#   Grade   -> positions grouped by grade
+# Every filter returns an ascending array of row positions, so filters combine by
+# intersection and a page is only materialized with page()
+class StudentIndex:
+	# Build the indexes over a scored DataFrame (roll_no, name, ..., GPA, Grade)
+	def __init__(self, df):
+		self.df = df.reset_index(drop=True)
+		self._roll_no = pd.Index(self.df["roll_no"])
+		if len(self._roll_no):
+			self._roll_no.get_loc(self._roll_no[0])  # Build the hash table now, not on the first search
+
+		names = self.df["name"].astype(str).str.lower().to_numpy(dtype=object)
+		self._name_order = np.argsort(names, kind="stable")
+		self._names = names[self._name_order]
+
+		gpa = self.df["GPA"].to_numpy(dtype=float)
+		self._gpa_order = np.argsort(gpa, kind="stable")
+		self._gpa = gpa[self._gpa_order]
+
+		grades = self.df["Grade"].to_numpy(dtype=object)
+		self._grades = {grade: np.flatnonzero(grades == grade) for grade in pd.unique(grades)}
+
+	# Number of indexed students
+	def __len__(self):
+		return len(self.df)
+
+	# Bytes held by the frame and the indexes (used by the result cache size estimate)
+	def memory_usage(self, deep=True):
+		arrays = [self._name_order, self._gpa_order, self._gpa, *self._grades.values()]
+		return pd.Series([
+			int(self.df.memory_usage(deep=deep).sum()),
+			self._roll_no.memory_usage(deep=deep),
+			self._names.nbytes,  # Lower-case name strings are not counted
+			sum(array.nbytes for array in arrays),
+		])
+
+	# Positions of the students with this roll number (empty if there are none)
+	def by_roll_no(self, roll_no):
+		try:
+			loc = self._roll_no.get_loc(roll_no)
+		except (KeyError, TypeError):
+			return np.empty(0, dtype=np.intp)
+		if isinstance(loc, slice):
+			return np.arange(len(self))[loc]
+		if isinstance(loc, np.ndarray):
+			return np.flatnonzero(loc)
+		return np.array([loc], dtype=np.intp)
+
+	# Positions of the students whose name starts with prefix (case-insensitive)
+	def by_name_prefix(self, prefix):
+		prefix = str(prefix).lower()
+		start = np.searchsorted(self._names, prefix, side="left")
+		stop = np.searchsorted(self._names, prefix + _PREFIX_END, side="left")
+		return np.sort(self._name_order[start:stop])
+
+	# Positions of the students with low <= GPA <= high
+	# Either bound may be None; inclusive works like pandas Series.between
+	# ("both", "neither", "left" or "right"), e.g. GPA < 2.0 is
+	# by_gpa(high=2.0, inclusive="left")
+	def by_gpa(self, low=None, high=None, inclusive="both"):
+		if inclusive not in ("both", "neither", "left", "right"):
+			raise ValueError(f"inclusive must be 'both', 'neither', 'left' or 'right', not {inclusive!r}")
+		start, stop = 0, len(self._gpa)
+		if low is not None:
+			side = "left" if inclusive in ("both", "left") else "right"
+			start = np.searchsorted(self._gpa, low, side=side)
+		if high is not None:
+			side = "right" if inclusive in ("both", "right") else "left"
+			stop = np.searchsorted(self._gpa, high, side=side)
+		return np.sort(self._gpa_order[start:max(start, stop)])
+
+	# Positions of the students with any of the given grades
+	def by_grade(self, grades):
+		if isinstance(grades, str):
+			grades = [grades]
+		parts = [self._grades[grade] for grade in grades if grade in self._grades]
+		if not parts:
+			return np.empty(0, dtype=np.intp)
+		return np.sort(np.concatenate(parts))
+
+	# Combine filters; arguments left as None do not filter
+	# search matches an exact roll number or a name prefix
+	# Returns an ascending array of row positions
+	def query(self, search=None, gpa_min=None, gpa_max=None, grades=None, inclusive="both"):
+		result = None
+
+		def narrow(positions):
+			return positions if result is None else np.intersect1d(result, positions, assume_unique=True)
+
+		if search:
+			search = str(search).strip()
+			matches = self.by_name_prefix(search)
+			if self._roll_no.dtype.kind in "iuf":
+				try:
+					matches = np.union1d(matches, self.by_roll_no(int(search)))
+				except ValueError:
+					pass
+			else:
+				matches = np.union1d(matches, self.by_roll_no(search))
+			result = narrow(matches)
+		if gpa_min is not None or gpa_max is not None:
+			result = narrow(self.by_gpa(gpa_min, gpa_max, inclusive))
+		if grades is not None:
+			result = narrow(self.by_grade(grades))
+		return np.arange(len(self)) if result is None else result
+
+	# Materialize one page of rows (page numbers start at 1)
+	# sort_by: optional column to order the matches by before paging; GPA uses the
+	# prebuilt index, other columns sort only the matching rows
+	# Returns (page DataFrame, number of pages)
+	def page(self, positions, page=1, page_size=50, sort_by=None, ascending=True):
+		if page_size < 1:
+			raise ValueError("page_size must be at least 1")
+		if sort_by == "GPA":
+			mask = np.zeros(len(self), dtype=bool)
+			mask[positions] = True
+			positions = self._gpa_order[mask[self._gpa_order]]
+			if not ascending:
+				positions = positions[::-1]
+		elif sort_by is not None:
+			values = self.df[sort_by].to_numpy()[positions]
+			order = np.argsort(values, kind="stable")
+			positions = positions[order if ascending else order[::-1]]
+		pages = max(1, -(-len(positions) // page_size))
+		page = min(max(1, page), pages)
+		start = (page - 1) * page_size
+		return self.df.iloc[positions[start:start + page_size]], pages
@@ -1,14 +1,38 @@
 # Import required libraries for data manipulation and student processing
 import pandas as pd  # For DataFrame operations and data handling
 from .student import Student  # Import the Student class from the same package
+from .schema import DEFAULT_SCHEMA  # Subjects, weights, mark ranges and grade thresholds
+
+
+# Subject columns scored for every student (same order as the Student constructor)
+SUBJECTS = DEFAULT_SCHEMA.subject_names
+
+
+# Score a whole DataFrame in one vectorized pass instead of building Student objects
+# schema: a SubjectSchema (default: math/science/english like Student)
+# With the default schema the results are identical to Student: marks must be
+# numbers between 0 and 100, GPA is the mean mark divided by 25 rounded to 2 places,
+# grades use the same A/B/C/D thresholds, and the first invalid mark raises the
+# same ValueError message
+def score_dataframe(df, schema=None):
+	return (schema or DEFAULT_SCHEMA).compile().score(df)
 
 
 # Class to manage and process student reports
 class StudentReport:
 	# Initialize the report with a DataFrame containing raw student data
-	def __init__(self, df):
+	# batch=True scores all rows at once with score_dataframe and skips the
+	# per-row Student objects (self.students stays empty in that mode)
+	# schema: optional SubjectSchema; Student only knows the default three subjects,
+	# so a custom schema always uses batch mode
+	def __init__(self, df, batch=False, schema=None):
 		self.df = df  # Store the original DataFrame with student marks
-		self.students = self.create_students()  # Create Student objects from DataFrame rows
+		self.batch = batch or schema is not None
+		if self.batch:
+			self.scored = score_dataframe(df, schema)  # Enriched DataFrame with GPA and grades
+			self.students = []
+		else:
+			self.students = self.create_students()  # Create Student objects from DataFrame rows
 
 	# Create Student objects from each row in the DataFrame
 	def create_students(self):
@@ -22,6 +46,10 @@ class StudentReport:
 
 	# Convert the list of Student objects back to a DataFrame with calculated values
 	def to_dataframe(self):
+		# In batch mode the scored frame is already built
+		if self.batch:
+			return self.scored.copy()
+
 		# Create a new DataFrame from Student objects with additional computed fields
 		# Each Student object now has GPA and Grade calculated based on their marks
 		return pd.DataFrame([{
@@ -32,4 +60,4 @@ class StudentReport:
 			"english": s.english,        # English marks (validated)
 			"GPA": s.gpa,               # Calculated GPA (0-4 scale)
 			"Grade": s.grade            # Assigned letter grade (A, B, C, D)
-		} for s in self.students])      # Iterate through all Student objects
\ No newline at end of file
+		} for s in self.students])      # Iterate through all Student objects
@@ -0,0 +1,230 @@
+# Import required libraries for declarative subject schemas
+import json  # For loading schemas from JSON files
+from dataclasses import dataclass, field  # For the declarative schema classes
+from functools import lru_cache  # For compiling each schema only once
+
+import numpy as np   # For the vectorized validator and scorer
+import pandas as pd  # For building the scored DataFrame
+
+
+# One subject: its CSV column, weight in the GPA and valid mark range
+@dataclass(frozen=True)
+class Subject:
+	name: str
+	weight: float = 1.0
+	min_mark: float = 0.0
+	max_mark: float = 100.0
+
+	# Name used in error messages, e.g. "Math" (same as Student)
+	@property
+	def label(self):
+		return self.name.capitalize()
+
+
+# Declarative description of what a school scores:
+# subjects (with weights and mark ranges), GPA scale and grade thresholds.
+# Each subject's mark is turned into a percentage of its range, the weighted mean
+# percentage is scaled to gpa_scale and rounded to 2 places, and the grade is the
+# first threshold the GPA reaches (highest first), else fallback_grade.
+# The default schema reproduces Student exactly.
+@dataclass(frozen=True)
+class SubjectSchema:
+	subjects: tuple = ()
+	grade_thresholds: tuple = (("A", 3.5), ("B", 3.0), ("C", 2.0))
+	fallback_grade: str = "D"
+	gpa_scale: float = 4.0
+	id_columns: tuple = field(default=("roll_no", "name"))
+
+	# Subject column names in order
+	@property
+	def subject_names(self):
+		return [subject.name for subject in self.subjects]
+
+	# Every column an upload must have
+	@property
+	def required_columns(self):
+		return list(self.id_columns) + self.subject_names
+
+	# Letter grades from best to worst, including the fallback
+	@property
+	def grades(self):
+		return [grade for grade, _ in sorted(self.grade_thresholds, key=lambda t: -t[1])] + [self.fallback_grade]
+
+	# Compile the schema into its vectorized validator and scorer (cached per schema)
+	def compile(self):
+		return _compile(self)
+
+	# Build a schema from a dict such as:
+	# {"subjects": [{"name": "math", "weight": 2}, {"name": "art", "max_mark": 50}],
+	#  "grades": {"A": 3.5, "B": 3.0, "C": 2.0}, "fallback_grade": "D", "gpa_scale": 4.0}
+	# Subjects may also be given as plain names; numbers may be given as strings
+	# Any problem with the dict raises ValueError
+	@classmethod
+	def from_dict(cls, data):
+		try:
+			subjects = tuple(_subject_from_dict(s) for s in data["subjects"])
+		except (KeyError, TypeError, ValueError) as e:
+			raise ValueError(f"Invalid subject list: {e}") from None
+		if not subjects:
+			raise ValueError("A subject schema needs at least one subject")
+		# Subjects become columns next to the id columns and the scored GPA / Grade
+		taken = set(cls.id_columns) | {"GPA", "Grade"}
+		for subject in subjects:
+			if not isinstance(subject.name, str) or not subject.name:
+				raise ValueError(f"Subject names must be non-empty strings, not {subject.name!r}")
+			if subject.name in taken:
+				raise ValueError(f"Subject {subject.name!r} is listed twice or clashes with an output column")
+			taken.add(subject.name)
+			if not subject.max_mark > subject.min_mark:
+				raise ValueError(f"Invalid mark range for {subject.name}")
+			if not subject.weight > 0:
+				raise ValueError(f"Weight for {subject.name} must be positive")
+		kwargs = {"subjects": subjects}
+		if "gpa_scale" in data:
+			try:
+				kwargs["gpa_scale"] = float(data["gpa_scale"])
+			except (TypeError, ValueError) as e:
+				raise ValueError(f"Invalid GPA scale: {e}") from None
+			if not kwargs["gpa_scale"] > 0:
+				raise ValueError("The GPA scale must be positive")
+		if "grades" in data:
+			# Cut-offs are checked best first, so keep them in descending order
+			try:
+				thresholds = sorted(((grade, float(gpa)) for grade, gpa in data["grades"].items()),
+									key=lambda item: item[1], reverse=True)
+			except (AttributeError, TypeError, ValueError) as e:
+				raise ValueError(f"Invalid grade cut-offs: {e}") from None
+			for grade, _ in thresholds:
+				if not isinstance(grade, str) or not grade:
+					raise ValueError(f"Grades must be non-empty strings, not {grade!r}")
+			if len({gpa for _, gpa in thresholds}) < len(thresholds):
+				raise ValueError("Two grades have the same cut-off")
+			kwargs["grade_thresholds"] = tuple(thresholds)
+		if "fallback_grade" in data:
+			kwargs["fallback_grade"] = data["fallback_grade"]
+			if not isinstance(kwargs["fallback_grade"], str) or not kwargs["fallback_grade"]:
+				raise ValueError(f"The fallback grade must be a non-empty string, not {kwargs['fallback_grade']!r}")
+		# The default cut-offs are checked too, e.g. against a smaller gpa_scale
+		gpa_scale = kwargs.get("gpa_scale", cls.gpa_scale)
+		fallback_grade = kwargs.get("fallback_grade", cls.fallback_grade)
+		for grade, gpa in kwargs.get("grade_thresholds", cls.grade_thresholds):
+			if not 0 <= gpa <= gpa_scale:
+				raise ValueError(f"Cut-off for grade {grade} must be between 0 and the GPA scale ({gpa_scale:g})")
+			if grade == fallback_grade:
+				raise ValueError(f"The fallback grade {fallback_grade} also has a cut-off")
+		return cls(**kwargs)
+
+	# Load a schema from a JSON file path or file-like object
+	@classmethod
+	def from_json(cls, source):
+		if hasattr(source, "read"):
+			return cls.from_dict(json.load(source))
+		with open(source, encoding="utf-8") as f:
+			return cls.from_dict(json.load(f))
+
+
+# Build a Subject from a plain name or a dict, converting its numbers with float()
+def _subject_from_dict(entry):
+	if isinstance(entry, str):
+		return Subject(entry)
+	entry = dict(entry)
+	for key in ("weight", "min_mark", "max_mark"):
+		if key in entry:
+			entry[key] = float(entry[key])
+	return Subject(**entry)
+
+
+# The built-in three-subject schema (math, science, english, equal weights, 0-100)
+DEFAULT_SCHEMA = SubjectSchema(subjects=(Subject("math"), Subject("science"), Subject("english")))
+
+
+# Convert a column of marks to a float array the same way float() does per value,
+# turning values float() would reject into NaN so they are flagged as invalid
+def _to_float(column):
+	try:
+		return column.to_numpy(dtype=float)
+	except (ValueError, TypeError):
+		return pd.to_numeric(column, errors="coerce").to_numpy(dtype=float)
+
+
+# A schema compiled into arrays: validation and scoring run over all subject
+# columns at once, so the cost per cell stays the same however many subjects there are
+class CompiledSchema:
+	# Precompute the per-subject arrays used by every call
+	def __init__(self, schema):
+		self.schema = schema
+		self.subjects = schema.subject_names
+		self.mins = np.array([s.min_mark for s in schema.subjects], dtype=float)
+		self.maxs = np.array([s.max_mark for s in schema.subjects], dtype=float)
+		self.weights = np.array([s.weight for s in schema.subjects], dtype=float)
+		# Subjects already on a 0-100 scale are used as-is (no rounding from rescaling)
+		self.rescale = [(s.min_mark, s.max_mark) != (0.0, 100.0) for s in schema.subjects]
+		ordered = sorted(schema.grade_thresholds, key=lambda t: -t[1])
+		self.thresholds = [gpa for _, gpa in ordered]
+		self.grade_labels = [grade for grade, _ in ordered]
+		self.fallback_grade = schema.fallback_grade
+		self.points_per_gpa = 100 / schema.gpa_scale  # 25 on the default 4.0 scale
+
+	# Read every subject column into one (rows x subjects) float matrix
+	def marks(self, df):
+		values = np.empty((len(df), len(self.subjects)))
+		for j, subject in enumerate(self.subjects):
+			values[:, j] = _to_float(df[subject])
+		return values
+
+	# Boolean (rows x subjects) matrix of marks that are missing, not numeric or out of range
+	def invalid_cells(self, values):
+		return ~((values >= self.mins) & (values <= self.maxs))
+
+	# Raise the same ValueError as Student would for the first invalid mark
+	def raise_first_invalid(self, df, invalid):
+		row = int(np.argmax(invalid.any(axis=1)))
+		j = int(np.argmax(invalid[row]))
+		subject = self.schema.subjects[j]
+		value = df[subject.name].iloc[row]
+		try:
+			float(value)
+		except (ValueError, TypeError) as e:
+			raise ValueError(f"Invalid {subject.label} mark: {e}")
+		raise ValueError(f"Invalid {subject.label} mark: {subject.label} mark must be between "
+						 f"{subject.min_mark:g} and {subject.max_mark:g}")
+
+	# GPA (rounded to 2 places) from a validated marks matrix
+	def gpa(self, values):
+		# Accumulate the weighted percentages column by column, in subject order, so
+		# equal weights give exactly np.mean([math, science, english]) like Student
+		total = np.zeros(len(values))
+		for j in range(len(self.subjects)):
+			column = values[:, j]
+			if self.rescale[j]:
+				column = (column - self.mins[j]) / (self.maxs[j] - self.mins[j]) * 100
+			total = total + self.weights[j] * column
+		percentage = total / self.weights.sum()
+		return np.round(percentage / self.points_per_gpa, 2)
+
+	# Letter grades for an array of GPAs
+	def grades(self, gpa):
+		conditions = [gpa >= threshold for threshold in self.thresholds]
+		return np.select(conditions, self.grade_labels, default=self.fallback_grade).astype(object)
+
+	# Validate and score a DataFrame in one vectorized pass
+	# values: the marks matrix when the caller already built it (e.g. while validating)
+	# Raises ValueError for the first invalid mark; returns id columns, marks, GPA and Grade
+	def score(self, df, values=None):
+		values = self.marks(df) if values is None else values
+		invalid = self.invalid_cells(values)
+		if invalid.any():
+			self.raise_first_invalid(df, invalid)
+		gpa = self.gpa(values)
+		scored = {column: df[column].to_numpy() for column in self.schema.id_columns}
+		for j, subject in enumerate(self.subjects):
+			scored[subject] = values[:, j]
+		scored["GPA"] = gpa
+		scored["Grade"] = self.grades(gpa)
+		return pd.DataFrame(scored)
+
+
+# Compile each distinct schema once
+@lru_cache(maxsize=32)
+def _compile(schema):
+	return CompiledSchema(schema)
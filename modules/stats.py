@@ -0,0 +1,325 @@
+# Import required libraries for running (chunk-by-chunk) summary statistics
+import numpy as np   # For vectorized per-chunk statistics
+import pandas as pd  # For returning the summary as a DataFrame like df.describe()
+
+
+# Class keeping running aggregates over scored chunks without storing the rows
+# Per column it tracks count, mean, sum of squared deviations (for std), min and max,
+# plus a histogram of letter grades; chunks are combined with Chan's parallel formula
+# so the result matches a single pass over the whole file
+class RunningSummary:
+	# Initialize empty aggregates for the given numeric columns and letter grades
+	def __init__(self, columns=("math", "science", "english", "GPA"), grades=("A", "B", "C", "D")):
+		self.columns = list(columns)
+		self.grades = list(grades)
+		size = len(self.columns)
+		self.count = 0                      # Number of rows seen so far
+		self.mean = np.zeros(size)          # Running mean per column
+		self.m2 = np.zeros(size)            # Running sum of squared deviations per column
+		self.min = np.full(size, np.inf)    # Smallest value per column
+		self.max = np.full(size, -np.inf)   # Largest value per column
+		self.grade_counts = {}              # Letter grade -> number of students
+		self.rejected = 0                   # Rows skipped because they failed validation
+
+	# Add a scored chunk (output of score_dataframe) to the running aggregates
+	def update(self, scored):
+		if len(scored) == 0:
+			return
+		values = scored[self.columns].to_numpy(dtype=float)
+		other = RunningSummary(self.columns, self.grades)
+		other.count = len(values)
+		other.mean = values.mean(axis=0)
+		other.m2 = ((values - other.mean) ** 2).sum(axis=0)
+		other.min = values.min(axis=0)
+		other.max = values.max(axis=0)
+		if "Grade" in scored:
+			other.grade_counts = scored["Grade"].value_counts().to_dict()
+		self._merge_moments(other)
+
+	# Combine another RunningSummary (e.g. from another chunk or section) into this one
+	def merge(self, other):
+		self._merge_moments(other)
+
+	# Chan's parallel merge of the counts, moments, min/max and grade counts
+	# (subclasses keep their own extra state in step around it)
+	def _merge_moments(self, other):
+		total = self.count + other.count
+		if total == 0:
+			return
+		delta = other.mean - self.mean
+		self.mean = self.mean + delta * (other.count / total)
+		self.m2 = self.m2 + other.m2 + delta ** 2 * (self.count * other.count / total)
+		self.min = np.minimum(self.min, other.min)
+		self.max = np.maximum(self.max, other.max)
+		for grade, count in other.grade_counts.items():
+			self.grade_counts[grade] = self.grade_counts.get(grade, 0) + count
+		self.count = total
+		self.rejected += other.rejected
+
+	# Return count/mean/std/min/max per column, laid out like df.describe()
+	def to_frame(self):
+		# Sample standard deviation (ddof=1), the same as pandas uses
+		std = np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.full(len(self.columns), np.nan)
+		empty = self.count == 0
+		return pd.DataFrame(
+			[np.full(len(self.columns), float(self.count)),
+			 np.where(empty, np.nan, self.mean),
+			 std,
+			 np.where(empty, np.nan, self.min),
+			 np.where(empty, np.nan, self.max)],
+			index=["count", "mean", "std", "min", "max"],
+			columns=self.columns,
+		)
+
+	# Return the grade histogram as a Series ordered from best to worst grade
+	def grade_distribution(self):
+		return pd.Series(self.grade_counts, dtype="int64").reindex(self.grades, fill_value=0)
+
+
+# RunningSummary that also supports removing rows, for insert/update/delete batches
+# Besides the per-column aggregates it keeps the full co-moment matrix (for the
+# correlation matrix used by the heatmap) and a count per distinct value so min/max
+# survive deletions. Every add/remove costs O(batch); min/max are only rescanned over
+# the distinct values (at most a few thousand for marks and GPA) when the current
+# extreme is deleted
+class DeltaSummary(RunningSummary):
+	# Initialize empty aggregates for the given numeric columns and letter grades
+	def __init__(self, columns=("math", "science", "english", "GPA"), grades=("A", "B", "C", "D")):
+		super().__init__(columns, grades)
+		size = len(self.columns)
+		self.comoment = np.zeros((size, size))         # Sum of (x - mean)(y - mean) per column pair
+		self.value_counts = [{} for _ in self.columns]  # Per column: value -> number of rows
+
+	# Add scored rows to the aggregates
+	def add(self, scored):
+		self._apply(scored, 1)
+
+	# Remove previously added scored rows from the aggregates
+	def remove(self, scored):
+		self._apply(scored, -1)
+
+	# RunningSummary.update is an add for this class
+	def update(self, scored):
+		self.add(scored)
+
+	# Combine another DeltaSummary (e.g. from another section) into this one
+	# The co-moment matrices are combined with Chan's cross term and the distinct-value
+	# counts are summed, so rows from either side can still be removed afterwards
+	def merge(self, other):
+		if not isinstance(other, DeltaSummary):
+			raise TypeError("A DeltaSummary can only merge another DeltaSummary; add() the rows instead")
+		if other.columns != self.columns:
+			raise ValueError("Cannot merge delta summaries with different columns")
+		total = self.count + other.count
+		if total:
+			delta = other.mean - self.mean
+			self.comoment = self.comoment + other.comoment + np.outer(delta, delta) * (self.count * other.count / total)
+		for mine, theirs in zip(self.value_counts, other.value_counts):
+			for value, n in theirs.items():
+				mine[value] = mine.get(value, 0) + n
+		super().merge(other)  # count, mean, min / max, grade counts and rejected rows
+		self.m2 = np.clip(np.diag(self.comoment).copy(), 0, None)
+
+	# Merge or subtract one batch of rows (sign=1 adds, sign=-1 removes)
+	def _apply(self, scored, sign):
+		if len(scored) == 0:
+			return
+		values = scored[self.columns].to_numpy(dtype=float)
+		batch_count = len(values)
+		batch_mean = values.mean(axis=0)
+		centered = values - batch_mean
+		batch_comoment = centered.T @ centered
+
+		if sign > 0:
+			total = self.count + batch_count
+			delta = batch_mean - self.mean
+			self.comoment = self.comoment + batch_comoment + np.outer(delta, delta) * (self.count * batch_count / total)
+			self.mean = self.mean + delta * (batch_count / total)
+		else:
+			total = self.count - batch_count
+			if total < 0:
+				raise ValueError("Cannot remove more rows than were added")
+			if total == 0:
+				self.mean = np.zeros(len(self.columns))
+				self.comoment = np.zeros_like(self.comoment)
+			else:
+				# Invert Chan's merge: recover the aggregates of the remaining rows
+				remaining_mean = (self.mean * self.count - batch_mean * batch_count) / total
+				delta = batch_mean - remaining_mean
+				self.comoment = self.comoment - batch_comoment - np.outer(delta, delta) * (total * batch_count / self.count)
+				self.mean = remaining_mean
+		self.count = total
+		self.m2 = np.clip(np.diag(self.comoment).copy(), 0, None)
+
+		# Keep the distinct-value counts in step and refresh min/max from them
+		for i, column in enumerate(values.T):
+			counts = self.value_counts[i]
+			for value, n in zip(*np.unique(column, return_counts=True)):
+				value = float(value)
+				counts[value] = counts.get(value, 0) + sign * int(n)
+				if counts[value] == 0:
+					del counts[value]
+			if sign > 0:
+				self.min[i] = min(self.min[i], column.min())
+				self.max[i] = max(self.max[i], column.max())
+			elif counts:
+				if self.min[i] not in counts:
+					self.min[i] = min(counts)
+				if self.max[i] not in counts:
+					self.max[i] = max(counts)
+			else:
+				self.min[i], self.max[i] = np.inf, -np.inf
+
+		# Update the grade histogram
+		if "Grade" in scored:
+			for grade, n in scored["Grade"].value_counts().items():
+				self.grade_counts[grade] = self.grade_counts.get(grade, 0) + sign * int(n)
+
+	# Pearson correlation matrix of the tracked columns, like df[columns].corr()
+	def correlation(self):
+		scale = np.sqrt(np.diag(self.comoment))
+		with np.errstate(divide="ignore", invalid="ignore"):
+			corr = self.comoment / np.outer(scale, scale)
+		return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+# RunningSummary that also keeps a fixed-bin histogram per column
+# Marks and GPA are bounded (0-100 and 0-4 by default), so each column gets one bin
+# per `resolution` step across its range: with the default 0.01 every mark given to
+# two decimals and every GPA (rounded to 2 places) lands on its own bin, making the
+# results below exact. After the O(n) update, quantiles, percentile ranks and grade
+# counts for any set of thresholds take O(bins) instead of sorting or re-grading the
+# rows, and summaries of chunks or sections merge by adding their histograms
+class HistogramSummary(RunningSummary):
+	# Initialize empty histograms; ranges holds (lowest, highest) value per column
+	# grade_thresholds: (grade, minimum GPA) pairs, best first; lower GPAs get fallback_grade
+	def __init__(self, columns=("math", "science", "english", "GPA"), grades=("A", "B", "C", "D"),
+				 ranges=((0, 100), (0, 100), (0, 100), (0, 4)), resolution=0.01,
+				 grade_thresholds=(("A", 3.5), ("B", 3.0), ("C", 2.0)), fallback_grade="D"):
+		super().__init__(columns, grades)
+		if len(ranges) != len(self.columns):
+			raise ValueError("HistogramSummary needs one (low, high) range per column")
+		self.ranges = [(float(low), float(high)) for low, high in ranges]
+		self.resolution = resolution
+		self.grade_thresholds = tuple(grade_thresholds)
+		self.fallback_grade = fallback_grade
+		self.bins = [np.zeros(int(round((high - low) / resolution)) + 1, dtype=np.int64)
+					 for low, high in self.ranges]
+
+	# Build an empty summary for a SubjectSchema's subjects and GPA (default schema if None)
+	@classmethod
+	def for_schema(cls, schema=None, resolution=0.01):
+		from .schema import DEFAULT_SCHEMA
+		schema = schema or DEFAULT_SCHEMA
+		return cls(schema.subject_names + ["GPA"], schema.grades,
+				   ranges=[(s.min_mark, s.max_mark) for s in schema.subjects] + [(0, schema.gpa_scale)],
+				   resolution=resolution, grade_thresholds=schema.grade_thresholds,
+				   fallback_grade=schema.fallback_grade)
+
+	# Bytes held by the histograms and the per-column aggregates (used by the result
+	# cache size estimate); deep is accepted for symmetry with pandas
+	def memory_usage(self, deep=True):
+		return pd.Series([
+			sum(bins.nbytes for bins in self.bins),
+			sum(array.nbytes for array in (self.mean, self.m2, self.min, self.max)),
+		])
+
+	# Add a scored chunk: moments as in RunningSummary, plus one bincount per column
+	def update(self, scored):
+		super().update(scored)
+		if len(scored) == 0:
+			return
+		for i, column in enumerate(self.columns):
+			index = self._bin_index(i, scored[column].to_numpy(dtype=float))
+			self.bins[i] += np.bincount(index, minlength=len(self.bins[i]))
+
+	# Combine another HistogramSummary (chunk or section) into this one
+	# A summary without histograms would leave the bins behind the count, so quantiles
+	# and percentile ranks would disagree with it; those are rejected
+	def merge(self, other):
+		if not isinstance(other, HistogramSummary):
+			raise TypeError("A HistogramSummary can only merge another HistogramSummary; update() the rows instead")
+		if other.columns != self.columns or other.ranges != self.ranges or other.resolution != self.resolution:
+			raise ValueError("Cannot merge histogram summaries with different columns, ranges or resolution")
+		for mine, theirs in zip(self.bins, other.bins):
+			mine += theirs
+		self._merge_moments(other)
+
+	# Bin number of each value (values outside the range go to the first / last bin)
+	def _bin_index(self, i, values):
+		low, _ = self.ranges[i]
+		index = np.rint((values - low) / self.resolution).astype(np.int64)
+		return np.clip(index, 0, len(self.bins[i]) - 1)
+
+	# Value represented by each bin number
+	def _bin_value(self, i, index):
+		return self.ranges[i][0] + np.asarray(index) * self.resolution
+
+	# Quantile(s) of a column using linear interpolation, like Series.quantile
+	# q: a number or sequence of numbers between 0 and 1
+	def quantile(self, column, q):
+		i = self.columns.index(column)
+		q = np.asarray(q, dtype=float)
+		total = int(self.bins[i].sum())
+		if total == 0:
+			return np.full(q.shape, np.nan) if q.ndim else np.nan
+		cumulative = np.cumsum(self.bins[i])
+		position = (total - 1) * q
+		lower = np.floor(position)
+		upper = np.minimum(lower + 1, total - 1)
+		low_value = self._bin_value(i, np.searchsorted(cumulative, lower, side="right"))
+		high_value = self._bin_value(i, np.searchsorted(cumulative, upper, side="right"))
+		result = low_value + (position - lower) * (high_value - low_value)
+		return result if q.ndim else float(result)
+
+	# Percentile rank of each value: percent of students scoring at or below it,
+	# like Series.rank(pct=True, method="max") * 100 for values in the data
+	def percentile_rank(self, column, values):
+		i = self.columns.index(column)
+		values = np.asarray(values, dtype=float)
+		total = int(self.bins[i].sum())
+		if total == 0:
+			return np.full(values.shape, np.nan)
+		cumulative = np.cumsum(self.bins[i])
+		low, high = self.ranges[i]
+		ranks = cumulative[self._bin_index(i, values)] / total * 100
+		ranks = np.where(values < low, 0.0, np.where(values > high, 100.0, ranks))
+		return ranks
+
+	# Return count/mean/std/min/quartiles/max per column, laid out like df.describe()
+	def to_frame(self, percentiles=(0.25, 0.5, 0.75)):
+		base = super().to_frame()
+		quantiles = pd.DataFrame(
+			[[self.quantile(column, p) for column in self.columns] for p in percentiles],
+			index=[f"{p * 100:g}%" for p in percentiles],
+			columns=self.columns,
+		)
+		return pd.concat([base.loc[["count", "mean", "std", "min"]], quantiles, base.loc[["max"]]])
+
+	# Number of students per grade if the GPA cut-offs were grade_thresholds
+	# (default: the current cut-offs), ordered from best to worst grade
+	def grade_counts_for(self, grade_thresholds=None):
+		grade_thresholds = self.grade_thresholds if grade_thresholds is None else grade_thresholds
+		i = self.columns.index("GPA")
+		# at_least[k] = number of students in bins k and above
+		at_least = np.concatenate([np.cumsum(self.bins[i][::-1])[::-1], [0]])
+		counts, taken = {}, 0
+		for grade, minimum in sorted(grade_thresholds, key=lambda item: item[1], reverse=True):
+			first = int(np.clip(np.ceil((minimum - self.ranges[i][0]) / self.resolution - 1e-9),
+								0, len(self.bins[i])))
+			above = int(at_least[first])
+			counts[grade] = max(above - taken, 0)
+			taken = max(taken, above)
+		counts[self.fallback_grade] = int(at_least[0]) - taken
+		return pd.Series(counts, dtype="int64").reindex(self.grades, fill_value=0)
+
+	# What-if for one grade boundary: counts per grade now and with grade's minimum
+	# GPA moved by shift (e.g. grade="B", shift=0.1 shows how many move from B to C)
+	# Returns a DataFrame with "current", "what_if" and "change" columns per grade
+	def threshold_shift(self, grade, shift):
+		cutoffs = dict(self.grade_thresholds)
+		if grade not in cutoffs:
+			raise ValueError(f"{grade} has no GPA cut-off (grades with cut-offs: {', '.join(cutoffs)})")
+		shifted = tuple((g, round(t + shift, 10) if g == grade else t) for g, t in self.grade_thresholds)
+		current, what_if = self.grade_counts_for(), self.grade_counts_for(shifted)
+		return pd.DataFrame({"current": current, "what_if": what_if, "change": what_if - current})
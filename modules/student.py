@@ -4,6 +4,9 @@ import numpy as np  # Used for calculating mean of marks and other numerical ope
 
 # Class representing a single student with their academic performance data
 class Student:
+    # Fixed attribute slots instead of a per-instance __dict__ (much smaller objects)
+    __slots__ = ("roll_no", "name", "math", "science", "english", "gpa", "grade")
+
     # Method to validate that marks are valid numbers within the acceptable range (0-100)
     def validate_marks(self, mark, subject):
         try:
@@ -0,0 +1,168 @@
+# Import required libraries for the compact, array-backed student container
+import numpy as np   # For the contiguous typed arrays holding every student
+import pandas as pd  # For converting from and to DataFrames
+from .report import score_dataframe  # Vectorized validation, GPA and grades
+from .schema import DEFAULT_SCHEMA  # Subjects and grades stored in the table
+from .student import Student  # For the shared validation / GPA / grade methods
+
+
+# Lightweight read-only view of one student in a StudentTable
+# It has the same attributes and methods as Student (subject marks are looked up by
+# name, e.g. row.math) but only stores a reference to the table and a row number,
+# so views are created on demand and cost a few bytes
+class StudentRow:
+    __slots__ = ("_table", "_index")
+
+    # Reuse Student's behaviour: these only read the mark attributes below
+    validate_marks = Student.validate_marks
+    calculate_gpa = Student.calculate_gpa
+    assign_grade = Student.assign_grade
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+
+    @property
+    def roll_no(self):
+        value = self._table.roll_no[self._index]
+        return value.item() if isinstance(value, np.generic) else value
+
+    @property
+    def name(self):
+        return self._table.name[self._index]
+
+    def __getattr__(self, name):
+        # Subject marks, e.g. row.math, row.science
+        table = object.__getattribute__(self, "_table")
+        try:
+            column = table.subjects.index(name)
+        except ValueError:
+            raise AttributeError(name) from None
+        return float(table.marks[self._index, column])
+
+    @property
+    def gpa(self):
+        # GPA is stored in hundredths, so dividing by 100 gives back the rounded value exactly
+        return int(self._table.gpa_centi[self._index]) / 100
+
+    @property
+    def grade(self):
+        return self._table.grades[self._table.grade_code[self._index]]
+
+    def __repr__(self):
+        return f"StudentRow(roll_no={self.roll_no!r}, name={self.name!r}, gpa={self.gpa}, grade={self.grade!r})"
+
+
+# Compact container for many students backed by contiguous typed arrays
+# Marks are float32, GPA is stored as uint16 hundredths (exact, since GPA is rounded
+# to 2 places) and grades as uint8 codes, so a student costs a few dozen bytes plus
+# its name instead of a full Python object. Validation, GPA and grades are computed
+# with score_dataframe, so they match Student exactly; marks are kept at float32
+# precision. Student's calculate_gpa/assign_grade on a row only apply to the
+# default three-subject schema.
+class StudentTable:
+    def __init__(self, roll_no, name, marks, gpa_centi, grade_code, schema=None):
+        """
+        Initialize the table from already-computed arrays (see from_dataframe).
+
+        Args:
+            roll_no (ndarray): Roll numbers.
+            name (ndarray): Student names (object array).
+            marks (ndarray): float32 marks, one column per subject in schema order.
+            gpa_centi (ndarray): uint16 GPA in hundredths.
+            grade_code (ndarray): uint8 index into the schema's grades (best first).
+            schema (SubjectSchema, optional): Subjects and grades; defaults to
+                math, science and english.
+        """
+        self.schema = schema or DEFAULT_SCHEMA
+        self.subjects = self.schema.subject_names
+        self.grades = np.array(self.schema.grades, dtype=object)
+        self.roll_no = roll_no
+        self.name = name
+        self.marks = marks
+        self.gpa_centi = gpa_centi
+        self.grade_code = grade_code
+        self._order = None  # Sorted roll_no positions, built on the first lookup
+        self._sorted_roll_no = None  # roll_no in that order, searched by lookup
+
+    @classmethod
+    def from_dataframe(cls, df, schema=None):
+        """
+        Validate and score a DataFrame of raw marks into a StudentTable.
+
+        Args:
+            df (DataFrame): Columns roll_no, name and one column per subject.
+            schema (SubjectSchema, optional): Subjects and grades to score with.
+
+        Returns:
+            StudentTable: The scored students.
+
+        Raises:
+            ValueError: With the same message as Student for the first invalid mark.
+        """
+        schema = schema or DEFAULT_SCHEMA
+        scored = score_dataframe(df, schema)
+        return cls(
+            roll_no=scored["roll_no"].to_numpy(),
+            name=scored["name"].to_numpy(dtype=object),
+            marks=np.ascontiguousarray(scored[schema.subject_names].to_numpy(dtype=np.float32)),
+            gpa_centi=np.rint(scored["GPA"].to_numpy() * 100).astype(np.uint16),
+            grade_code=pd.Categorical(scored["Grade"], categories=schema.grades).codes.astype(np.uint8),
+            schema=schema,
+        )
+
+    def __len__(self):
+        return len(self.roll_no)
+
+    def __getitem__(self, index):
+        """Return a StudentRow view of the student at position index."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("StudentTable index out of range")
+        return StudentRow(self, index)
+
+    def __iter__(self):
+        return (StudentRow(self, i) for i in range(len(self)))
+
+    def lookup(self, roll_no):
+        """
+        Find a student by roll number using a sorted index (binary search).
+
+        Args:
+            roll_no: Roll number to look up.
+
+        Returns:
+            StudentRow: View of the matching student.
+
+        Raises:
+            KeyError: If no student has this roll number.
+        """
+        if self._order is None:
+            self._order = np.argsort(self.roll_no, kind="stable")
+            self._sorted_roll_no = self.roll_no[self._order]
+        sorted_roll_no = self._sorted_roll_no
+        pos = np.searchsorted(sorted_roll_no, roll_no)
+        if pos < len(sorted_roll_no) and sorted_roll_no[pos] == roll_no:
+            return StudentRow(self, int(self._order[pos]))
+        raise KeyError(roll_no)
+
+    @property
+    def nbytes(self):
+        """Bytes used by the typed arrays (names are counted as pointers only)."""
+        return sum(array.nbytes for array in (self.roll_no, self.name, self.marks,
+                                              self.gpa_centi, self.grade_code))
+
+    def to_dataframe(self):
+        """
+        Convert back to a DataFrame laid out like StudentReport.to_dataframe.
+
+        Returns:
+            DataFrame: roll_no, name, subject marks, GPA and Grade.
+        """
+        df = pd.DataFrame({"roll_no": self.roll_no, "name": self.name})
+        for i, subject in enumerate(self.subjects):
+            df[subject] = self.marks[:, i].astype(float)
+        df["GPA"] = self.gpa_centi / 100
+        df["Grade"] = self.grades[self.grade_code]
+        return df
@@ -0,0 +1,11 @@
+# Shared fixtures for the test suite
+import pytest
+
+from benchmarks.bench import make_cohort
+
+
+# Factory for synthetic cohorts of raw marks: cohort(rows, seed=0) returns roll_no,
+# name, math, science and english (the same data the benchmarks run on)
+@pytest.fixture
+def cohort():
+	return make_cohort
@@ -0,0 +1,48 @@
+# Tests for the result cache
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from modules.cache import ResultCache, estimate_size
+from modules.stats import HistogramSummary
+from utils.file_utils import validate_dataframe
+
+
+def test_histogram_summary_size_counts_its_bins():
+	stats = HistogramSummary.for_schema()
+	assert estimate_size(stats) >= sum(bins.nbytes for bins in stats.bins)
+
+
+def test_validation_report_size_counts_its_frames():
+	n = 10_000
+	df = pd.DataFrame({"roll_no": np.arange(n), "name": ["x"] * n,
+					   "math": [200] * n, "science": [50] * n, "english": [50] * n})
+	report = validate_dataframe(df, max_errors=n)
+	assert estimate_size(report) >= report.errors.memory_usage(deep=True).sum() + report.bad_rows.nbytes
+
+
+# Pickled by an older version: references a class that no longer exists
+class Gone:
+	pass
+
+
+def test_stale_disk_entry_is_dropped(tmp_path, monkeypatch):
+	cache = ResultCache(disk_dir=str(tmp_path))
+	cache.put("key", {"value": Gone()})
+	cache.clear()
+	monkeypatch.delattr(sys.modules[__name__], "Gone")
+	assert cache.get("key") is None
+	assert not os.path.exists(tmp_path / "key.pkl")
+
+
+def test_truncated_disk_entry_is_dropped(tmp_path):
+	(tmp_path / "key.pkl").write_bytes(b"\x80\x05garbage")
+	assert ResultCache(disk_dir=str(tmp_path)).get("key") is None
+	assert not os.path.exists(tmp_path / "key.pkl")
+
+
+def test_disk_entry_survives_restart(tmp_path):
+	ResultCache(disk_dir=str(tmp_path)).put("key", {"pdf": b"%PDF"})
+	assert ResultCache(disk_dir=str(tmp_path)).get("key") == {"pdf": b"%PDF"}
@@ -0,0 +1,45 @@
+# Tests for the chart rendering helpers
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules import charts
+from modules.charts import LARGE_COHORT_THRESHOLD, save_gpa_trend_chart
+
+
+# Scored frame of n students with the given roll numbers, shuffled out of roll order
+def _scored(roll_no):
+	rng = np.random.default_rng(0)
+	df = pd.DataFrame({"roll_no": roll_no, "GPA": rng.uniform(0, 4, len(roll_no)).round(2)})
+	return df.sample(frac=1, random_state=0).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("mode", ["band", "lttb"])
+@pytest.mark.parametrize("roll_no", [
+	np.arange(1, LARGE_COHORT_THRESHOLD + 1001),
+	[f"S{i:05d}" for i in range(1, LARGE_COHORT_THRESHOLD + 1001)],
+], ids=["numeric", "string"])
+def test_large_cohort_gpa_trend(roll_no, mode):
+	buffer = BytesIO()
+	save_gpa_trend_chart(_scored(roll_no), buffer, mode=mode)
+	assert buffer.getvalue().startswith(b"\x89PNG")
+
+
+def test_small_cohort_gpa_trend_string_roll_no():
+	buffer = BytesIO()
+	save_gpa_trend_chart(_scored([f"S{i:05d}" for i in range(1, 51)]), buffer)
+	assert buffer.getvalue().startswith(b"\x89PNG")
+
+
+def test_render_all_charts_is_serial_without_an_executor(monkeypatch):
+	# Starting a pool per call costs more than drawing the charts
+	def no_pool(*args, **kwargs):
+		raise AssertionError("render_all_charts started a process pool")
+	monkeypatch.setattr(charts, "chart_process_pool", no_pool)
+	scored = _scored(np.arange(1, 101)).assign(
+		math=50.0, science=60.0, english=70.0, Grade="B")
+	images = charts.render_all_charts(scored)
+	assert list(images) == list(charts.CHARTS)
+	assert all(png.startswith(b"\x89PNG") for png in images.values())
@@ -0,0 +1,38 @@
+# Tests for exporting results and reading them back in every file format
+from io import BytesIO
+
+import pandas as pd
+import pytest
+
+from modules.report import score_dataframe
+from utils.file_utils import MissingColumnsError, export_dataframe, read_and_validate_csv
+
+
+@pytest.mark.parametrize("fmt, suffix", [("csv", ".csv"), ("parquet", ".parquet"), ("feather", ".feather")])
+def test_export_round_trip(cohort, tmp_path, fmt, suffix):
+	scored = score_dataframe(cohort(500))
+	required = ["roll_no", "name", "math", "science", "english"]
+
+	# In-memory upload, with the format detected from the file name
+	upload = BytesIO(export_dataframe(scored, fmt))
+	upload.name = f"results{suffix}"
+	df = read_and_validate_csv(upload)
+	pd.testing.assert_frame_equal(df[required], scored[required])
+
+	# Path on disk, written through the target argument (memory-mapped for Feather)
+	path = tmp_path / f"results{suffix}"
+	with open(path, "wb") as f:
+		export_dataframe(scored, fmt, target=f)
+	pd.testing.assert_frame_equal(read_and_validate_csv(path)[required], scored[required])
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_columnar_read_checks_columns(cohort, fmt):
+	upload = BytesIO(export_dataframe(cohort(10).drop(columns="science"), fmt))
+	with pytest.raises(MissingColumnsError):
+		read_and_validate_csv(upload, fmt=fmt)
+
+
+def test_unknown_export_format(cohort):
+	with pytest.raises(ValueError, match="Unsupported export format"):
+		export_dataframe(cohort(1), "xlsx")
@@ -0,0 +1,81 @@
+# Tests for the multi-term SQLite store
+import pandas as pd
+import pytest
+
+from modules.history import TermStore
+from modules.report import score_dataframe
+
+
+# Three terms of the same 300 students; marks drift between terms
+@pytest.fixture
+def terms(cohort):
+	return {f"2025-T{i + 1}": score_dataframe(cohort(300, seed=i)) for i in range(3)}
+
+
+@pytest.fixture
+def store(terms):
+	with TermStore() as store:
+		for term, scored in terms.items():
+			store.add_term(term, scored)
+		yield store
+
+
+def test_terms_and_trajectory(store, terms):
+	assert store.terms() == list(terms)
+	trajectory = store.trajectory(17)
+	assert trajectory["term"].tolist() == list(terms)
+	for (term, scored), (_, row) in zip(terms.items(), trajectory.iterrows()):
+		student = scored[scored["roll_no"] == 17].iloc[0]
+		assert (row["name"], row["GPA"], row["Grade"]) == (student["name"], student["GPA"], student["Grade"])
+	assert store.trajectory(10**6).empty
+
+
+def test_cohort_means_match_pandas(store, terms):
+	means = store.cohort_means()
+	assert means["term"].tolist() == list(terms)
+	for (_, row), scored in zip(means.iterrows(), terms.values()):
+		assert row["students"] == len(scored)
+		assert row["mean_GPA"] == pytest.approx(scored["GPA"].mean())
+		assert (row["min_GPA"], row["max_GPA"]) == (scored["GPA"].min(), scored["GPA"].max())
+		for subject in ("math", "science", "english"):
+			assert row[f"mean_{subject}"] == pytest.approx(scored[subject].mean())
+
+
+def test_largest_decliners_match_pandas(store, terms):
+	before, after = terms["2025-T2"], terms["2025-T3"]
+	merged = before.merge(after, on="roll_no", suffixes=("_from", "_to"))
+	merged["change"] = (merged["GPA_to"] - merged["GPA_from"]).round(2)
+	expected = merged[merged["change"] < 0].sort_values(["change", "roll_no"]).head(15)
+
+	decliners = store.largest_decliners(n=15)  # Defaults to the last two terms
+	assert decliners["roll_no"].tolist() == expected["roll_no"].tolist()
+	assert decliners["change"].tolist() == pytest.approx(expected["change"].tolist())
+	assert store.largest_decliners("2025-T2", "2025-T3", n=15).equals(decliners)
+
+
+def test_gpa_history_keeps_term_order(store, terms):
+	history = store.gpa_history(["2025-T3", "2025-T1"])
+	assert list(history["term"].cat.categories) == ["2025-T1", "2025-T3"]
+	expected = pd.concat([terms["2025-T1"], terms["2025-T3"]])
+	assert history["GPA"].tolist() == expected["GPA"].tolist()
+	assert store.gpa_history(["missing"]).empty
+
+
+def test_add_replace_and_remove_terms(store, terms):
+	with pytest.raises(ValueError, match="already stored"):
+		store.add_term("2025-T1", terms["2025-T1"])
+	with pytest.raises(ValueError, match="missing columns"):
+		store.add_term("2026-T1", terms["2025-T1"].drop(columns="GPA"))
+	assert store.terms() == list(terms)  # Failed adds leave nothing behind
+
+	# Replacing keeps the term's position; an explicit position sorts a new term first
+	store.add_term("2025-T1", terms["2025-T3"], replace=True)
+	store.add_term("2024-T3", terms["2025-T1"], position=-1)
+	assert store.terms() == ["2024-T3", "2025-T1", "2025-T2", "2025-T3"]
+	assert store.cohort_means()["mean_GPA"].iloc[1] == pytest.approx(terms["2025-T3"]["GPA"].mean())
+
+	store.remove_term("2025-T2")
+	assert store.terms() == ["2024-T3", "2025-T1", "2025-T3"]
+	assert store.gpa_history(["2025-T2"]).empty
+	with pytest.raises(ValueError, match="two terms"):
+		TermStore().largest_decliners()
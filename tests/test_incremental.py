@@ -0,0 +1,83 @@
+# Tests for incremental insert / update / delete batches
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.incremental import IncrementalReport
+from modules.report import score_dataframe
+
+
+# Scored students sorted by roll number, to compare reports built in different orders
+def _sorted(df):
+	return df.sort_values("roll_no").reset_index(drop=True)
+
+
+# The report's frame and aggregates must match scoring `raw` from scratch
+def _assert_matches_recompute(report, raw):
+	expected = _sorted(score_dataframe(raw))
+	pd.testing.assert_frame_equal(_sorted(report.to_dataframe()), expected)
+	columns = report.summary.columns
+	pd.testing.assert_frame_equal(report.summary.to_frame(), expected[columns].describe().loc[
+		["count", "mean", "std", "min", "max"]], check_exact=False, rtol=1e-9)
+	pd.testing.assert_frame_equal(report.correlation(), expected[columns].corr(), check_exact=False, rtol=1e-9)
+	assert {g: n for g, n in report.summary.grade_counts.items() if n} == expected["Grade"].value_counts().to_dict()
+
+
+def test_mixed_batch_matches_recompute(cohort):
+	raw = cohort(500)
+	report = IncrementalReport(raw.iloc[:400])
+	updates = raw.iloc[100:150].assign(math=100.0, science=0.0)
+	inserts = raw.iloc[400:]
+	deletes = raw["roll_no"].iloc[:50].tolist()
+	report.apply(inserts=inserts, updates=updates, deletes=deletes)
+
+	final = pd.concat([raw.iloc[50:100], updates, raw.iloc[150:]])
+	assert len(report) == len(final)
+	_assert_matches_recompute(report, final)
+	assert report.get(120)["math"] == 100.0
+
+
+def test_invalid_batch_leaves_report_untouched(cohort):
+	raw = cohort(200)
+	report = IncrementalReport(raw)
+	before, summary_before = report.to_dataframe(), report.summary.to_frame()
+	bad_inserts = cohort(201).iloc[200:].assign(math=150.0)
+
+	with pytest.raises(ValueError):
+		report.apply(inserts=bad_inserts, deletes=[1, 2, 3])  # Invalid mark
+	with pytest.raises(ValueError):
+		report.apply(updates=raw.iloc[:5], deletes=[1])  # Updating a deleted student
+	with pytest.raises(ValueError):
+		report.apply(inserts=raw.iloc[:1])  # Existing roll_no
+	with pytest.raises(ValueError):
+		report.apply(deletes=[1, 1])
+
+	pd.testing.assert_frame_equal(report.to_dataframe(), before)
+	pd.testing.assert_frame_equal(report.summary.to_frame(), summary_before)
+
+
+def test_compaction_after_mass_delete(cohort):
+	raw = cohort(3_000)
+	report = IncrementalReport(raw, capacity=16)  # Grows by doubling
+	deletes = [roll for roll in raw["roll_no"].tolist() if roll % 8 in (0, 1, 2, 3, 4)]
+	report.apply(deletes=deletes)
+	assert report._size == len(report) == 1_125  # Over half deleted: rows were reclaimed
+
+	remaining = raw[~raw["roll_no"].isin(deletes)]
+	_assert_matches_recompute(report, remaining)
+	assert report.get(7)["name"] == "Student 7"
+
+	# The rebuilt position index keeps working for later batches
+	report.apply(updates=remaining.iloc[:10].assign(english=0.0), inserts=raw[raw["roll_no"].isin(deletes[:5])])
+	final = pd.concat([remaining.iloc[:10].assign(english=0.0), remaining.iloc[10:],
+					   raw[raw["roll_no"].isin(deletes[:5])]])
+	_assert_matches_recompute(report, final)
+
+
+def test_deleting_everything_resets_aggregates(cohort):
+	raw = cohort(50)
+	report = IncrementalReport(raw)
+	report.apply(deletes=raw["roll_no"].tolist())
+	assert len(report) == 0
+	assert report.summary.count == 0
+	assert np.isinf(report.summary.min).all()
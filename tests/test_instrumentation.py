@@ -0,0 +1,44 @@
+# Tests for the per-stage pipeline timer
+from modules import instrumentation
+from modules.instrumentation import PipelineTimer
+
+
+def test_stage_records_memory():
+	timer = PipelineTimer(trace_memory=True)
+	with timer.stage("build", rows=3):
+		data = [0] * 100_000
+	record = timer.records[0]
+	assert record["peak_memory_bytes"] >= 100_000 * 8
+	assert record["process_peak_rss_bytes"] > 0
+	assert "student_pipeline_process_peak_rss_bytes" in timer.to_openmetrics()
+	del data
+
+
+def test_stage_without_resource_module(monkeypatch):
+	# e.g. Windows, where the resource module does not exist
+	monkeypatch.setattr(instrumentation, "resource", None)
+	timer = PipelineTimer()
+	with timer.stage("build"):
+		pass
+	assert timer.records[0]["process_peak_rss_bytes"] is None
+	assert timer.records[0]["peak_memory_bytes"] is None
+	assert "process_peak_rss_bytes" not in timer.to_openmetrics()
+	assert list(timer.to_frame().columns)[-1] == "process_peak_rss_bytes"
+
+
+def test_queued_job_traces_memory_per_stage(cohort):
+	import time
+	from modules.jobs import DONE, JobQueue
+
+	queue = JobQueue(max_workers=1)
+	try:
+		job = queue.submit("test", cohort(200).to_csv(index=False).encode(), "students.csv", trace_memory=True)
+		deadline = time.monotonic() + 120
+		while job.active and time.monotonic() < deadline:
+			time.sleep(0.05)
+		assert job.status == DONE, job.error
+	finally:
+		queue.shutdown()
+	frame = job.timer.to_frame().set_index("stage")
+	assert frame.loc["scoring", "peak_memory_bytes"] > 0
+	assert frame["peak_memory_bytes"].notna().all()
@@ -0,0 +1,61 @@
+# The standalone app and main.py must produce the same report for the same upload:
+# the standalone app calls run_pipeline directly, main.py submits the upload to the
+# shared JobQueue, which runs the pipeline in a worker thread with a shared chart pool
+import time
+from io import BytesIO
+
+import pytest
+from reportlab import rl_config
+
+from modules.cache import ResultCache
+from modules.jobs import DONE, JobQueue
+from modules.pipeline import run_pipeline
+from modules.report import StudentReport, score_dataframe
+
+
+@pytest.fixture
+def csv_bytes(cohort):
+	return cohort(200).to_csv(index=False).encode()
+
+
+# Make ReportLab PDFs byte-identical (fixed creation date and document id)
+@pytest.fixture
+def invariant_pdfs(monkeypatch):
+	monkeypatch.setattr(rl_config, "invariant", 1)
+
+
+# The standalone app's path: run_pipeline on the uploaded file
+def _standalone(data):
+	source = BytesIO(data)
+	source.name = "students.csv"
+	return run_pipeline(source)
+
+
+# main.py's path: submit the upload to the job queue and wait for the result
+def _queued(data):
+	queue = JobQueue(max_workers=1, cache=ResultCache())
+	try:
+		job = queue.submit("test", data, "students.csv")
+		deadline = time.monotonic() + 120
+		while job.active and time.monotonic() < deadline:
+			time.sleep(0.05)
+		assert job.status == DONE, job.error
+		return job.result
+	finally:
+		queue.shutdown()
+
+
+def test_standalone_and_queue_produce_the_same_report(csv_bytes, invariant_pdfs):
+	standalone, queued = _standalone(csv_bytes), _queued(csv_bytes)
+
+	assert standalone["df"].equals(queued["df"])
+	assert standalone["summary"].equals(queued["summary"])
+	assert standalone["charts"].keys() == queued["charts"].keys()
+	for name, png in standalone["charts"].items():
+		assert png == queued["charts"][name], name
+	assert standalone["pdf"] == queued["pdf"]
+
+
+def test_score_dataframe_matches_student_report(cohort):
+	df = cohort(200)
+	assert score_dataframe(df).equals(StudentReport(df).to_dataframe())
@@ -0,0 +1,72 @@
+# Tests for the indexed search, filter and paging layer
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.query import StudentIndex
+from modules.report import score_dataframe
+
+
+@pytest.fixture
+def scored(cohort):
+	df = score_dataframe(cohort(2_000, seed=3))
+	df.loc[df["roll_no"] % 7 == 0, "name"] = "Stu " + df["roll_no"].astype(str)  # A second name prefix
+	return df
+
+
+@pytest.mark.parametrize("inclusive", ["both", "neither", "left", "right"])
+def test_query_matches_pandas_filters(scored, inclusive):
+	index = StudentIndex(scored)
+	grades = ["A", "C"]
+	positions = index.query(search="stu", gpa_min=2.0, gpa_max=3.5, grades=grades, inclusive=inclusive)
+	expected = scored[scored["name"].str.lower().str.startswith("stu")
+					  & scored["GPA"].between(2.0, 3.5, inclusive=inclusive)
+					  & scored["Grade"].isin(grades)]
+	assert positions.tolist() == expected.index.tolist()
+
+
+def test_single_filters(scored):
+	index = StudentIndex(scored)
+	assert index.by_roll_no(42).tolist() == [41]
+	assert len(index.by_roll_no(10**9)) == 0
+	assert len(index.by_roll_no("not a number")) == 0
+	assert index.by_name_prefix("STU ").tolist() == np.flatnonzero(scored["roll_no"] % 7 == 0).tolist()
+	assert index.by_gpa(high=2.0, inclusive="left").tolist() == np.flatnonzero(scored["GPA"] < 2.0).tolist()
+	assert index.by_grade("F").tolist() == np.flatnonzero(scored["Grade"] == "F").tolist()
+	assert len(index.by_grade("Z")) == 0
+	assert index.query().tolist() == list(range(len(scored)))
+	# A numeric search matches the roll number as well as name prefixes
+	assert index.query(search="14").tolist() == [13]
+	with pytest.raises(ValueError, match="inclusive"):
+		index.by_gpa(1, 2, inclusive="all")
+
+
+@pytest.mark.parametrize("sort_by, ascending", [(None, True), ("GPA", True), ("GPA", False), ("math", False)])
+def test_page_matches_sorted_slices(scored, sort_by, ascending):
+	index = StudentIndex(scored)
+	positions = index.query(grades=["B", "C"])
+	matches = scored.iloc[positions]
+	if sort_by is not None:
+		matches = matches.sort_values(sort_by, ascending=ascending, kind="stable")
+	page_size = 37
+	pages = -(-len(matches) // page_size)
+	for page in (1, 2, pages):
+		df, total = index.page(positions, page, page_size, sort_by, ascending)
+		assert total == pages
+		expected = matches.iloc[(page - 1) * page_size:page * page_size]
+		# Descending pages reverse the order of ties, so only the sort key is compared there
+		key = sort_by or "roll_no"
+		assert df[key].tolist() == expected[key].tolist()
+		if ascending:
+			pd.testing.assert_frame_equal(df, expected)
+
+
+def test_page_bounds(scored):
+	index = StudentIndex(scored)
+	positions = index.by_roll_no(1)
+	df, pages = index.page(positions, page=5, page_size=10)  # Clamped to the last page
+	assert pages == 1 and df["roll_no"].tolist() == [1]
+	df, pages = index.page(np.empty(0, dtype=np.intp))
+	assert pages == 1 and df.empty
+	with pytest.raises(ValueError, match="page_size"):
+		index.page(positions, page_size=0)
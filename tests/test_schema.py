@@ -0,0 +1,50 @@
+# Tests for loading subject schemas
+import pytest
+
+from modules.schema import SubjectSchema
+
+
+def test_numbers_given_as_strings_are_converted():
+	schema = SubjectSchema.from_dict({"subjects": [{"name": "m", "weight": "2", "max_mark": "50"}],
+									  "gpa_scale": "5"})
+	assert schema.subjects[0].weight == 2.0
+	assert schema.subjects[0].max_mark == 50.0
+	assert schema.gpa_scale == 5.0
+
+
+@pytest.mark.parametrize("data", [
+	{"subjects": [{"name": "m", "weight": "heavy"}]},
+	{"subjects": [{"name": "m", "weight": None}]},
+	{"subjects": [{"name": "m", "colour": "red"}]},
+	{"subjects": ["m"], "gpa_scale": "abc"},
+	{"subjects": ["m"], "gpa_scale": 0},
+	{"subjects": ["m"], "gpa_scale": -4},
+	{"subjects": ["m"], "grades": {"A": "top"}},
+	{"subjects": ["m"], "grades": ["A"]},
+	{"subjects": ["math", "math"]},
+	{"subjects": ["math", {"name": "math", "weight": 2}]},
+	{"subjects": ["GPA"]},
+	{"subjects": ["Grade"]},
+	{"subjects": ["roll_no"]},
+	{"subjects": ["name"]},
+	{"subjects": [{"name": 5}]},
+	{"subjects": [""]},
+	{"subjects": ["m"], "fallback_grade": ["x"]},
+	{"subjects": ["m"], "fallback_grade": ""},
+	{"subjects": ["m"], "fallback_grade": "A"},
+	{"subjects": ["m"], "grades": {"A": 9}},
+	{"subjects": ["m"], "grades": {"A": -1}},
+	{"subjects": ["m"], "grades": {"A": 3.0, "B": 3.0}},
+	{"subjects": ["m"], "grades": {"A": 1.5}, "gpa_scale": 1},
+	{"subjects": ["m"], "gpa_scale": 2},
+])
+def test_invalid_schemas_raise_value_error(data):
+	with pytest.raises(ValueError):
+		SubjectSchema.from_dict(data)
+
+
+def test_custom_grades_within_the_scale():
+	schema = SubjectSchema.from_dict({"subjects": ["m"], "gpa_scale": 10,
+									  "grades": {"B": 6, "A": 8.5}, "fallback_grade": "F"})
+	assert schema.grade_thresholds == (("A", 8.5), ("B", 6.0))
+	assert schema.grades == ["A", "B", "F"]
@@ -0,0 +1,109 @@
+# Tests for the running, delta and histogram summaries
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.report import score_dataframe
+from modules.stats import DeltaSummary, HistogramSummary, RunningSummary
+
+
+def test_delta_summary_merge_matches_single_add(cohort):
+	first, second = score_dataframe(cohort(300, seed=1)), score_dataframe(cohort(200, seed=2))
+	whole = DeltaSummary()
+	whole.add(pd.concat([first, second]))
+	merged, other = DeltaSummary(), DeltaSummary()
+	merged.add(first)
+	other.add(second)
+	merged.merge(other)
+
+	assert merged.count == whole.count
+	np.testing.assert_allclose(merged.mean, whole.mean)
+	np.testing.assert_allclose(merged.m2, whole.m2)
+	np.testing.assert_allclose(merged.comoment, whole.comoment)
+	np.testing.assert_array_equal(merged.min, whole.min)
+	np.testing.assert_array_equal(merged.max, whole.max)
+	assert merged.value_counts == whole.value_counts
+	assert merged.grade_counts == whole.grade_counts
+	pd.testing.assert_frame_equal(merged.correlation(), whole.correlation())
+
+	# Rows from the merged-in side can still be removed
+	merged.remove(second)
+	expected = DeltaSummary()
+	expected.add(first)
+	np.testing.assert_allclose(merged.comoment, expected.comoment, atol=1e-6)
+	np.testing.assert_array_equal(merged.min, expected.min)
+	assert merged.value_counts == expected.value_counts
+
+
+def test_delta_summary_merge_into_empty(cohort):
+	other = DeltaSummary()
+	other.add(score_dataframe(cohort(50, seed=3)))
+	merged = DeltaSummary()
+	merged.merge(other)
+	np.testing.assert_allclose(merged.comoment, other.comoment)
+	assert merged.value_counts == other.value_counts
+
+
+def test_delta_summary_rejects_other_summaries():
+	with pytest.raises(TypeError):
+		DeltaSummary().merge(RunningSummary())
+	with pytest.raises(ValueError):
+		DeltaSummary().merge(DeltaSummary(columns=("math", "GPA")))
+
+
+@pytest.fixture
+def scored_cohort(cohort):
+	return score_dataframe(cohort(2_000, seed=4))
+
+
+def test_histogram_summary_matches_describe(scored_cohort):
+	stats = HistogramSummary.for_schema()
+	stats.update(scored_cohort)
+	expected = scored_cohort[stats.columns].describe(percentiles=[0.1, 0.25, 0.5, 0.75, 0.9])
+	pd.testing.assert_frame_equal(stats.to_frame(percentiles=(0.1, 0.25, 0.5, 0.75, 0.9)), expected,
+								  check_exact=False, rtol=1e-9)
+
+
+def test_percentile_rank_matches_series_rank(scored_cohort):
+	stats = HistogramSummary.for_schema()
+	stats.update(scored_cohort)
+	for column in stats.columns:
+		expected = scored_cohort[column].rank(pct=True, method="max") * 100
+		np.testing.assert_allclose(stats.percentile_rank(column, scored_cohort[column]), expected)
+
+
+@pytest.mark.parametrize("grade, shift", [("A", 0.1), ("B", -0.25), ("C", 0.5), ("C", -2.0)])
+def test_threshold_shift_matches_regrading(scored_cohort, grade, shift):
+	stats = HistogramSummary.for_schema()
+	stats.update(scored_cohort)
+	shifted = {g: t + shift if g == grade else t for g, t in stats.grade_thresholds}
+
+	# Regrade every student the slow way: first cut-off reached, best first
+	def regrade(gpa, cutoffs):
+		for g, minimum in sorted(cutoffs.items(), key=lambda item: item[1], reverse=True):
+			if gpa >= minimum - 1e-9:
+				return g
+		return stats.fallback_grade
+
+	expected = scored_cohort["GPA"].map(lambda gpa: regrade(gpa, shifted)).value_counts()
+	table = stats.threshold_shift(grade, shift)
+	assert table["what_if"].to_dict() == expected.reindex(stats.grades, fill_value=0).to_dict()
+	assert table["current"].to_dict() == scored_cohort["Grade"].value_counts().reindex(
+		stats.grades, fill_value=0).to_dict()
+
+
+def test_histogram_summary_merge_matches_single_update(cohort):
+	first, second = score_dataframe(cohort(700, seed=5)), score_dataframe(cohort(300, seed=6))
+	whole = HistogramSummary.for_schema()
+	whole.update(pd.concat([first, second]))
+	merged, other = HistogramSummary.for_schema(), HistogramSummary.for_schema()
+	merged.update(first)
+	other.update(second)
+	merged.merge(other)
+	pd.testing.assert_frame_equal(merged.to_frame(), whole.to_frame())
+	pd.testing.assert_series_equal(merged.grade_counts_for(), whole.grade_counts_for())
+
+
+def test_histogram_summary_rejects_summaries_without_bins():
+	with pytest.raises(TypeError):
+		HistogramSummary.for_schema().merge(RunningSummary())
@@ -0,0 +1,50 @@
+# Tests for the array-backed student container
+import pytest
+
+from modules.report import score_dataframe
+from modules.student import Student
+from modules.student_table import StudentTable
+
+
+def test_to_dataframe_round_trip(cohort):
+	raw = cohort(500)
+	table = StudentTable.from_dataframe(raw)
+	assert table.to_dataframe().equals(score_dataframe(raw))
+
+
+def test_lookup_hits_and_misses(cohort):
+	raw = cohort(100).sample(frac=1, random_state=0).reset_index(drop=True)  # Out of roll order
+	table = StudentTable.from_dataframe(raw)
+	for roll_no in (1, 50, 100):
+		row = table.lookup(roll_no)
+		assert row.roll_no == roll_no
+		assert row.name == f"Student {roll_no}"
+	for roll_no in (0, 101, -5):
+		with pytest.raises(KeyError):
+			table.lookup(roll_no)
+
+
+def test_lookup_reuses_the_sorted_index(cohort):
+	table = StudentTable.from_dataframe(cohort(100))
+	table.lookup(1)
+	sorted_roll_no = table._sorted_roll_no
+	table.lookup(2)
+	assert table._sorted_roll_no is sorted_roll_no
+
+
+def test_rows_score_like_student(cohort):
+	raw = cohort(300, seed=1)
+	table = StudentTable.from_dataframe(raw)
+	for row, values in zip(table, raw.itertuples(index=False)):
+		student = Student(values.roll_no, values.name, values.math, values.science, values.english)
+		assert row.calculate_gpa() == student.gpa == row.gpa
+		assert row.assign_grade() == student.grade == row.grade
+
+
+def test_invalid_mark_raises_like_student(cohort):
+	raw = cohort(5)
+	raw.loc[2, "science"] = 120
+	with pytest.raises(ValueError, match="Science"):
+		StudentTable.from_dataframe(raw)
+	with pytest.raises(ValueError, match="Science"):
+		Student(3, "x", 50, 120, 50)
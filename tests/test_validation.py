@@ -0,0 +1,63 @@
+# Tests for the vectorized validation pass and the streaming reader
+from io import BytesIO
+
+import pandas as pd
+import pytest
+
+from cli import build_parser
+from utils.file_utils import (CSVReadError, DataValidationError, stream_and_score_csv, validate_and_score,
+							  validate_dataframe)
+
+
+# Three students, two with invalid marks
+def _raw():
+	return pd.DataFrame({
+		"roll_no": [1, 2, 3],
+		"name": ["Asha", "Ben", "Chen"],
+		"math": [90, 120, 75],
+		"science": [80, 70, "x"],
+		"english": [70, 60, 50],
+	})
+
+
+def test_error_message_without_listed_errors():
+	with pytest.raises(DataValidationError) as e:
+		validate_and_score(_raw(), max_errors=0)
+	assert e.value.report.error_count == 2
+	assert len(e.value.report.errors) == 0
+	assert "2 invalid values in 2 rows" in str(e.value)
+
+
+def test_error_message_names_first_error():
+	with pytest.raises(DataValidationError, match=r"first: row 1, math"):
+		validate_and_score(_raw())
+
+
+@pytest.mark.parametrize("validate", [validate_dataframe, validate_and_score])
+def test_negative_max_errors_is_rejected(validate):
+	with pytest.raises(ValueError, match="max_errors"):
+		validate(_raw(), max_errors=-1)
+
+
+def test_cli_rejects_negative_max_errors():
+	parser = build_parser()
+	assert parser.parse_args(["report", "s.csv", "--out", "o", "--max-errors", "0"]).max_errors == 0
+	with pytest.raises(SystemExit):
+		parser.parse_args(["report", "s.csv", "--out", "o", "--max-errors", "-1"])
+
+
+_HEADER = b"roll_no,name,math,science,english\n"
+
+
+def test_streaming_skips_blank_lines_and_keeps_line_numbers():
+	data = _HEADER + b"1,a,50,60,70\n2,b,50,60,70\n\n3,c,500,60,70\n\n4,d,1,2,3\n"
+	summary, bad_rows = stream_and_score_csv(BytesIO(data), chunksize=2)
+	assert summary.count == 3
+	assert summary.rejected == 1
+	assert bad_rows == [{"line": 5, "column": "math", "reason": "mark must be between 0 and 100"}]
+
+
+def test_streaming_wraps_parser_errors_in_later_chunks():
+	data = _HEADER + b"1,a,50,60,70\n" * 5 + b'6,"b,50,60,70\n'
+	with pytest.raises(CSVReadError):
+		stream_and_score_csv(BytesIO(data), chunksize=2)
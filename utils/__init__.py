@@ -0,0 +1 @@
+# File reading, validation and export helpers shared by every front-end
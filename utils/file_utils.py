@@ -0,0 +1,386 @@
+# Import required libraries for file processing
+# Errors are raised as exceptions (no Streamlit import) so headless jobs can reuse
+# the validation; the web app catches them and shows the message
+import os  # For detecting the file format from its extension
+from io import BytesIO  # For in-memory exports
+
+import numpy as np  # For vectorized row-level validation of streamed chunks
+import pandas as pd  # For reading and manipulating CSV data
+# pyarrow (Parquet and Arrow IPC / Feather support) is imported only when one of
+# those formats is used
+
+from modules.report import score_dataframe  # Vectorized GPA and grade scoring
+from modules.schema import DEFAULT_SCHEMA  # Subjects and mark ranges to validate against
+from modules.stats import HistogramSummary  # Running aggregates and histograms over scored chunks
+
+
+# Columns that must exist in every uploaded CSV file (with the default schema;
+# every function below takes an optional SubjectSchema for other subject sets)
+REQUIRED_COLUMNS = DEFAULT_SCHEMA.required_columns
+
+# File extension -> format for uploads and exports
+FILE_FORMATS = {".csv": "csv", ".parquet": "parquet", ".pq": "parquet",
+				".feather": "feather", ".arrow": "feather", ".ipc": "feather"}
+
+# Format -> (display name, default export file name, MIME type)
+FORMAT_DETAILS = {
+	"csv": ("CSV", "analyzed_students.csv", "text/csv"),
+	"parquet": ("Parquet", "analyzed_students.parquet", "application/vnd.apache.parquet"),
+	"feather": ("Feather", "analyzed_students.feather", "application/vnd.apache.arrow.file"),
+}
+
+
+# Base class for every problem found while reading or validating an upload
+# Subclasses ValueError so callers already catching ValueError keep working
+class CSVValidationError(ValueError):
+	pass
+
+
+# Raised when the file cannot be parsed at all
+class CSVReadError(CSVValidationError):
+	def __init__(self, error, fmt="csv"):
+		super().__init__(f"Error reading {FORMAT_DETAILS[fmt][0]} file: {str(error)}")
+		self.error = error  # The original parser exception
+		self.format = fmt   # Format the file was read as
+
+
+# Raised when required columns are missing from the header
+class MissingColumnsError(CSVValidationError):
+	def __init__(self, columns):
+		super().__init__(f"Missing required columns: {', '.join(columns)}")
+		self.columns = columns  # Names of the missing columns
+
+
+# Raised when a required column contains empty cells
+class EmptyValuesError(CSVValidationError):
+	def __init__(self, column):
+		super().__init__(f"Found empty values in column: {column}")
+		self.column = column  # Name of the column with empty cells
+
+
+# Raised when validate_dataframe finds invalid cells; report lists all of them
+class DataValidationError(CSVValidationError):
+	def __init__(self, report):
+		message = f"{report.error_count} invalid values in {report.bad_row_count} rows"
+		if len(report.errors):
+			first = report.errors.iloc[0]
+			message += f" (first: row {first['row']}, {first['column']}: {first['reason']})"
+		else:
+			# max_errors=0 lists no cells; name the most common problem instead
+			top = report.counts.loc[report.counts["count"].idxmax()]
+			message += f" (most common: {top['column']}: {top['reason']}, {top['count']} values)"
+		super().__init__(message)
+		self.report = report  # ValidationReport with every problem found
+
+
+# Every problem found by one validation pass over a DataFrame
+# errors:  DataFrame of row (position in the data, 0 = first row), column and reason
+#          for the first max_errors problems in row order
+# counts:  DataFrame of column, reason and count over all problems (never capped)
+# bad_rows: boolean mask of rows with at least one problem
+class ValidationReport:
+	def __init__(self, errors, counts, bad_rows, max_errors):
+		self.errors = errors
+		self.counts = counts
+		self.bad_rows = bad_rows
+		self.max_errors = max_errors
+
+	# True when no problem was found
+	@property
+	def ok(self):
+		return not self.bad_rows.any()
+
+	# Number of invalid cells, including those beyond max_errors
+	@property
+	def error_count(self):
+		return int(self.counts["count"].sum())
+
+	# Number of rows with at least one invalid cell
+	@property
+	def bad_row_count(self):
+		return int(self.bad_rows.sum())
+
+	# True when errors lists only the first max_errors problems
+	@property
+	def truncated(self):
+		return self.error_count > len(self.errors)
+
+	# Bytes held by the error list, the counts and the bad-row mask (used by the
+	# result cache size estimate)
+	def memory_usage(self, deep=True):
+		return pd.Series([
+			int(self.errors.memory_usage(deep=deep).sum()),
+			int(self.counts.memory_usage(deep=deep).sum()),
+			self.bad_rows.nbytes,
+		])
+
+
+# Work out the format of an upload from fmt or the file name's extension (default CSV)
+def detect_format(uploaded_file, fmt=None):
+	if fmt:
+		return fmt
+	name = uploaded_file if isinstance(uploaded_file, (str, os.PathLike)) else getattr(uploaded_file, "name", "")
+	return FILE_FORMATS.get(os.path.splitext(str(name))[1].lower(), "csv")
+
+
+# Read only the required columns of a Parquet or Arrow IPC (Feather) file
+# Paths to Arrow IPC files are memory-mapped, so the columns are not copied
+# until they are converted to pandas
+def _read_columnar(uploaded_file, fmt, required_columns):
+	import pyarrow as pa
+	import pyarrow.parquet as pq
+
+	is_path = isinstance(uploaded_file, (str, os.PathLike))
+	if fmt == "parquet":
+		source = pq.ParquetFile(uploaded_file)
+		names = source.schema_arrow.names
+	else:
+		if is_path:
+			stream = pa.memory_map(str(uploaded_file))
+		elif hasattr(uploaded_file, "getbuffer"):
+			stream = pa.BufferReader(uploaded_file.getbuffer())  # Zero-copy view of the upload
+		else:
+			stream = uploaded_file
+		source = pa.ipc.open_file(stream)
+		names = source.schema.names
+
+	# Check the schema before reading any data
+	missing_columns = [col for col in required_columns if col not in names]
+	if missing_columns:
+		raise MissingColumnsError(missing_columns)
+
+	if fmt == "parquet":
+		table = source.read(columns=required_columns)
+	else:
+		table = source.read_all().select(required_columns)
+	return table.to_pandas()
+
+
+# Function to read and validate CSV, Parquet or Arrow IPC (Feather) files uploaded by users
+# fmt: "csv", "parquet" or "feather"; detected from the file name when not given
+# schema: optional SubjectSchema deciding the required columns
+# check_values=False skips the empty-cell check, for callers that run
+# validate_and_score next and want every bad cell reported at once
+def read_and_validate_csv(uploaded_file, fmt=None, schema=None, check_values=True):
+	# Define the columns that must exist in the file
+	required_columns = (schema or DEFAULT_SCHEMA).required_columns
+
+	# Step 1: Attempt to read the uploaded file
+	fmt = detect_format(uploaded_file, fmt)
+	try:
+		if fmt == "csv":
+			# Use pandas to read the CSV file into a DataFrame
+			df = pd.read_csv(uploaded_file)
+		else:
+			# Columnar formats only load the required columns
+			df = _read_columnar(uploaded_file, fmt, required_columns)
+	except CSVValidationError:
+		raise
+	except Exception as e:
+		# If file reading fails, stop with a read error
+		raise CSVReadError(e, fmt)
+
+	# Step 2: Validate that all required columns are present
+	# Check which required columns are missing from the uploaded file
+	missing_columns = [col for col in required_columns if col not in df.columns]
+	
+	# If any required columns are missing, stop to prevent further processing
+	if missing_columns:
+		raise MissingColumnsError(missing_columns)
+
+	# Step 3: Check for empty/null values in required columns
+	# Iterate through each required column to check for missing data
+	for col in required_columns if check_values else []:
+		# Check if any cell in this column is null/empty
+		if df[col].isnull().any():
+			# If empty values found, stop to prevent invalid data processing
+			raise EmptyValuesError(col)
+
+	# Step 4: Return the validated DataFrame if all checks pass
+	# At this point, the CSV file has been successfully validated:
+	# - File was readable
+	# - All required columns are present
+	# - No empty values in critical columns
+	return df
+
+
+# Yield (bad cell mask, column, reason) for every check on every required column
+# values: the (rows x subjects) marks matrix from CompiledSchema.marks
+# duplicates: also flag repeated roll numbers (every occurrence after the first)
+def _cell_checks(df, schema, values, duplicates=False):
+	subjects = {subject.name: j for j, subject in enumerate(schema.subjects)}
+	for col in schema.required_columns:
+		# Empty cells are invalid in every required column
+		empty = df[col].isnull().to_numpy()
+		yield empty, col, "empty value"
+
+		# Marks must also be numbers within the subject's range
+		if col in subjects:
+			subject = schema.subjects[subjects[col]]
+			marks = values[:, subjects[col]]
+			yield ~empty & np.isnan(marks), col, "not a number"
+			yield (~np.isnan(marks) & ~((marks >= subject.min_mark) & (marks <= subject.max_mark)), col,
+				   f"mark must be between {subject.min_mark:g} and {subject.max_mark:g}")
+
+		# Each roll number may appear only once
+		if duplicates and col == "roll_no":
+			yield ~empty & df[col].duplicated(keep="first").to_numpy(), col, "duplicate roll_no"
+
+
+# Check every required cell of a DataFrame at once: empty cells, marks that are not
+# numbers or out of range, and duplicate roll numbers
+# Returns (ValidationReport, marks matrix); the matrix is reused for scoring
+def _validate(df, schema, max_errors):
+	if max_errors < 0:
+		raise ValueError(f"max_errors must be 0 or more, not {max_errors}")
+	compiled = schema.compile()
+	values = compiled.marks(df)
+	bad = np.zeros(len(df), dtype=bool)
+	positions, columns, reasons, counts = [], [], [], []
+	for mask, col, reason in _cell_checks(df, schema, values, duplicates=True):
+		found = np.flatnonzero(mask)
+		if len(found):
+			bad |= mask
+			positions.append(found)
+			columns.append(np.full(len(found), schema.required_columns.index(col)))
+			reasons.append(np.full(len(found), len(counts)))
+			counts.append((col, reason, len(found)))
+
+	# Keep the first max_errors problems in row order (then column order)
+	if positions:
+		positions, columns, reasons = (np.concatenate(a) for a in (positions, columns, reasons))
+		order = np.lexsort((columns, positions))[:max_errors]
+		errors = pd.DataFrame({
+			"row": positions[order],
+			"column": np.asarray(schema.required_columns, dtype=object)[columns[order]],
+			"reason": np.asarray([reason for _, reason, _ in counts], dtype=object)[reasons[order]],
+		})
+	else:
+		errors = pd.DataFrame({"row": pd.Series(dtype="int64"), "column": pd.Series(dtype=object),
+							   "reason": pd.Series(dtype=object)})
+	counts = pd.DataFrame(counts, columns=["column", "reason", "count"])
+	return ValidationReport(errors, counts, bad, max_errors), values
+
+
+# Validate a DataFrame of raw marks in one vectorized pass and report every problem
+# Unlike scoring, which stops at the first invalid mark, every required cell is
+# checked; the report lists up to max_errors problems and counts all of them
+def validate_dataframe(df, schema=None, max_errors=1000):
+	schema = schema or DEFAULT_SCHEMA
+	missing_columns = [col for col in schema.required_columns if col not in df.columns]
+	if missing_columns:
+		raise MissingColumnsError(missing_columns)
+	return _validate(df, schema, max_errors)[0]
+
+
+# Validate and score a DataFrame in the same pass
+# quarantine=False raises DataValidationError (with the full report) when any cell is
+# invalid; quarantine=True sets the bad rows aside and scores the rest
+# Returns (scored rows, quarantined raw rows, ValidationReport)
+def validate_and_score(df, schema=None, quarantine=False, max_errors=1000):
+	schema = schema or DEFAULT_SCHEMA
+	missing_columns = [col for col in schema.required_columns if col not in df.columns]
+	if missing_columns:
+		raise MissingColumnsError(missing_columns)
+	report, values = _validate(df, schema, max_errors)
+	if not report.ok and not quarantine:
+		raise DataValidationError(report)
+	good = ~report.bad_rows
+	scored = schema.compile().score(df[good] if not report.ok else df, values[good])
+	return scored, df[report.bad_rows], report
+
+
+# Find the invalid rows of a raw chunk and the reason each one was rejected
+# Returns a boolean mask of bad rows plus a list of (row position, column, reason)
+# holding the first problem found in each bad row
+def _find_bad_rows(chunk, schema):
+	bad = np.zeros(len(chunk), dtype=bool)
+	problems = []
+	values = schema.compile().marks(chunk)
+	for mask, col, reason in _cell_checks(chunk, schema, values):
+		# Only the first problem per row is reported
+		new = mask & ~bad
+		problems.extend((int(pos), col, reason) for pos in np.flatnonzero(new))
+		bad |= new
+	problems.sort()  # Report bad rows in file order
+	return bad, problems
+
+
+# Read a CSV file in chunks, validate and score each chunk as it arrives
+# Yields (scored chunk, bad rows) pairs so callers only ever hold one chunk in memory;
+# bad rows are dicts with the CSV line number, the column and the reason
+def iter_scored_csv_chunks(uploaded_file, chunksize=50_000, schema=None):
+	schema = schema or DEFAULT_SCHEMA
+	required_columns = schema.required_columns
+
+	# Only load the required columns; blank lines are read (as all-empty rows) so line
+	# numbers stay accurate, then skipped like read_csv does by default
+	# (line numbers assume no quoted field spans several lines)
+	try:
+		reader = pd.read_csv(uploaded_file, chunksize=chunksize, skip_blank_lines=False,
+							 usecols=lambda col: col in required_columns)
+	except Exception as e:
+		raise CSVReadError(e)
+
+	first_line = 2  # Line 1 is the header row
+	chunks = iter(reader)
+	while True:
+		# Parser errors surface while reading a chunk, not when the reader is created
+		try:
+			chunk = next(chunks)
+		except StopIteration:
+			break
+		except Exception as e:
+			raise CSVReadError(e)
+
+		# The header is checked on the first chunk, just like read_and_validate_csv
+		missing_columns = [col for col in required_columns if col not in chunk.columns]
+		if missing_columns:
+			raise MissingColumnsError(missing_columns)
+
+		blank = chunk.isna().all(axis=1).to_numpy()
+		lines = first_line + np.flatnonzero(~blank)  # CSV line of each remaining row
+		first_line += len(chunk)
+		chunk = chunk[~blank]
+
+		bad, problems = _find_bad_rows(chunk, schema)
+		bad_rows = [{"line": int(lines[pos]), "column": col, "reason": reason}
+					for pos, col, reason in problems]
+
+		# Score only the rows that passed validation
+		yield score_dataframe(chunk[~bad], schema), bad_rows
+
+
+# Stream a CSV file through validation and scoring with bounded memory
+# Peak memory depends on chunksize, not on the file size: scored rows are handed to
+# on_chunk (if given) and then dropped, and only running aggregates are kept.
+# Returns (HistogramSummary, bad rows); at most max_errors bad rows are listed and
+# summary.rejected holds the total number of rejected rows
+def stream_and_score_csv(uploaded_file, chunksize=50_000, on_chunk=None, max_errors=1000, schema=None):
+	schema = schema or DEFAULT_SCHEMA
+	summary = HistogramSummary.for_schema(schema)
+	errors = []
+	for scored, bad_rows in iter_scored_csv_chunks(uploaded_file, chunksize, schema):
+		summary.update(scored)
+		summary.rejected += len(bad_rows)
+		errors.extend(bad_rows[:max(max_errors - len(errors), 0)])
+		if on_chunk is not None:
+			on_chunk(scored)
+	return summary, errors
+
+
+# Write a scored DataFrame as CSV, Parquet or Arrow IPC (Feather)
+# target: path or writable binary file; when None the encoded bytes are returned
+# Writing to a path lets pyarrow stream the columns straight to disk without an
+# intermediate Python string
+def export_dataframe(df, fmt="csv", target=None):
+	buffer = BytesIO() if target is None else target
+	if fmt == "csv":
+		df.to_csv(buffer, index=False)
+	elif fmt == "parquet":
+		df.to_parquet(buffer, index=False)
+	elif fmt == "feather":
+		df.reset_index(drop=True).to_feather(buffer)
+	else:
+		raise ValueError(f"Unsupported export format: {fmt}")
+	return buffer.getvalue() if target is None else target